@@ -1,19 +1,38 @@
 #!/usr/bin/env python3
 
-from typing import List
+from typing import List, Optional
 from ethereum_node.block.header import BlockHeader
 from ethereum_node.utils.rlp import encode
 
 
 class Block:
+    """A header with its body.
+
+    The encoding is memoized. The transaction and uncle lists are treated
+    as immutable once rlp() has been called; headers are immutable, and
+    replacing `header` is picked up because the new one has another
+    cached encoding.
+    """
+
+    __slots__ = ("header", "transactions", "uncles", "_rlp", "_header_rlp")
+
     def __init__(self, header: BlockHeader, transactions: List[bytes], uncles: List[BlockHeader]):
         self.header = header
         self.transactions = transactions
         self.uncles = uncles
+        self._rlp: Optional[bytes] = None
+        self._header_rlp: Optional[bytes] = None
 
     def rlp(self) -> bytes:
-        return encode([
-            self.header.rlp(),
-            [tx for tx in self.transactions],
-            [uncle.rlp() for uncle in self.uncles]
-        ])
+        header_rlp = self.header.rlp()
+        if self._rlp is None or header_rlp is not self._header_rlp:
+            self._rlp = encode([
+                header_rlp,
+                [tx for tx in self.transactions],
+                [uncle.rlp() for uncle in self.uncles]
+            ])
+            self._header_rlp = header_rlp
+        return self._rlp
+
+    def hash(self) -> bytes:
+        return self.header.hash()
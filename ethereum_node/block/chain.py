@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# block/chain.py
+#
+# Persistent header index:
+#   b"h" + hash          -> header RLP
+#   b"c" + number (8 BE) -> canonical hash at that height
+#   b"head"              -> hash of the canonical head
+#
+
+from typing import Optional
+
+from ethereum_node.block.header import BlockHeader
+from ethereum_node.db.base import BaseKV
+from ethereum_node.utils.lru import LRUCache
+
+HEADER_PREFIX = b"h"
+CANONICAL_PREFIX = b"c"
+HEAD_KEY = b"head"
+
+HEADER_CACHE_SIZE = 4096  # decoded headers kept in memory
+
+
+def header_key(block_hash: bytes) -> bytes:
+    return HEADER_PREFIX + block_hash
+
+
+def canonical_key(number: int) -> bytes:
+    return CANONICAL_PREFIX + number.to_bytes(8, "big")
+
+
+class HeaderChain:
+    """Headers by hash and the canonical chain by number, both O(1).
+
+    set_head() rewrites only the part of the canonical table that differs
+    between the old and new head, in one write batch.
+    """
+
+    def __init__(self, db: BaseKV, cache_size: int = HEADER_CACHE_SIZE):
+        self.db = db
+        self._headers = LRUCache(cache_size)
+
+    def add_header(self, header: BlockHeader, canonical: bool = False) -> bytes:
+        block_hash = header.hash()
+        self.db.put(header_key(block_hash), header.rlp())
+        self._headers.put(block_hash, header)
+        if canonical:
+            self.set_head(block_hash)
+        return block_hash
+
+    def get_header(self, block_hash: bytes) -> Optional[BlockHeader]:
+        header = self._headers.get(block_hash)
+        if header is None:
+            encoded = self.db.get(header_key(block_hash))
+            if encoded is None:
+                return None
+            header = BlockHeader.from_rlp(encoded)
+            self._headers.put(block_hash, header)
+        return header
+
+    def has_header(self, block_hash: bytes) -> bool:
+        return block_hash in self._headers or self.db.get(header_key(block_hash)) is not None
+
+    def get_canonical_hash(self, number: int) -> Optional[bytes]:
+        return self.db.get(canonical_key(number))
+
+    def get_header_by_number(self, number: int) -> Optional[BlockHeader]:
+        block_hash = self.get_canonical_hash(number)
+        return self.get_header(block_hash) if block_hash else None
+
+    def is_canonical(self, block_hash: bytes) -> bool:
+        header = self.get_header(block_hash)
+        return header is not None and self.get_canonical_hash(header.number) == block_hash
+
+    @property
+    def head_hash(self) -> Optional[bytes]:
+        return self.db.get(HEAD_KEY)
+
+    @property
+    def head(self) -> Optional[BlockHeader]:
+        head_hash = self.head_hash
+        return self.get_header(head_hash) if head_hash else None
+
+    def set_head(self, block_hash: bytes) -> None:
+        """Make `block_hash` the canonical head, rewriting numbers that changed."""
+        header = self.get_header(block_hash)
+        if header is None:
+            raise KeyError(f"Unknown header {block_hash.hex()}")
+        head_hash = block_hash
+        old_head = self.head
+        with self.db.write_batch() as batch:
+            if old_head is not None:
+                for number in range(header.number + 1, old_head.number + 1):
+                    batch.delete(canonical_key(number))
+            while self.get_canonical_hash(header.number) != block_hash:
+                batch.put(canonical_key(header.number), block_hash)
+                if header.number == 0:
+                    break
+                block_hash = header.parent_hash
+                header = self.get_header(block_hash)
+                if header is None:
+                    raise KeyError(f"Missing ancestor {block_hash.hex()}")
+            batch.put(HEAD_KEY, head_hash)
+
+    def get_ancestor_hash(self, block_hash: bytes, depth: int) -> Optional[bytes]:
+        """Hash of the block `depth` generations above `block_hash`.
+
+        Walks parents only until the branch joins the canonical chain;
+        from there the answer is one index lookup.
+        """
+        header = self.get_header(block_hash)
+        while header is not None and depth > 0:
+            if self.get_canonical_hash(header.number) == block_hash:
+                if depth > header.number:
+                    return None
+                return self.get_canonical_hash(header.number - depth)
+            block_hash = header.parent_hash
+            header = self.get_header(block_hash)
+            depth -= 1
+        return block_hash if header is not None else None
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 
-#!/usr/bin/env python3
-
-from dataclasses import dataclass
-from ethereum_node.utils.rlp import encode
+from dataclasses import dataclass, field, replace
+from typing import Optional
+from ethereum_node.utils.rlp import decode, encode, list_payload, wrap_list
 from ethereum_node.utils.hash import keccak256
 
-@dataclass
+SEAL_SUFFIX = 33 + 9    # encoded 32-byte mix_hash and 8-byte nonce
+
+
+def seal_hash_of(encoded: bytes) -> bytes:
+    """Seal hash straight from a header encoding with a 32-byte mix_hash and
+    8-byte nonce: the last two items are cut off the payload, nothing is
+    re-encoded."""
+    return keccak256(wrap_list(list_payload(encoded)[:-SEAL_SUFFIX]))
+
+
+@dataclass(slots=True, frozen=True)
 class BlockHeader:
+    """Immutable; dataclasses.replace() gives a changed copy with nothing
+    cached, and with_seal() one that keeps the seal hash."""
+
     parent_hash: bytes
     ommers_hash: bytes
     coinbase: bytes
@@ -23,9 +35,29 @@ class BlockHeader:
     extra_data: bytes
     mix_hash: bytes
     nonce: bytes
+    _rlp: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _hash: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _seal_hash: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_rlp(cls, encoded: bytes) -> "BlockHeader":
+        fields = decode(encoded)
+        if len(fields) != 15:
+            raise ValueError(f"Header has {len(fields)} fields, expected 15")
+        for i in (7, 8, 9, 10, 11):
+            fields[i] = int.from_bytes(fields[i], "big")
+        header = cls(*fields)
+        object.__setattr__(header, "_rlp", bytes(encoded))
+        return header
 
     def rlp(self):
-        return encode([
+        if self._rlp is None:
+            object.__setattr__(self, "_rlp", encode(self._fields() + [self.mix_hash, self.nonce]))
+        return self._rlp
+
+    def _fields(self) -> list:
+        """Every field but mix_hash and nonce, in encoding order."""
+        return [
             self.parent_hash,
             self.ommers_hash,
             self.coinbase,
@@ -39,9 +71,28 @@ class BlockHeader:
             self.gas_used,
             self.timestamp,
             self.extra_data,
-            self.mix_hash,
-            self.nonce,
-        ])
+        ]
 
     def hash(self):
-        return keccak256(self.rlp())
+        if self._hash is None:
+            object.__setattr__(self, "_hash", keccak256(self.rlp()))
+        return self._hash
+
+    def seal_hash(self):
+        """Hash of the header without mix_hash and nonce: what PoW seals."""
+        if self._seal_hash is None:
+            if len(self.mix_hash) == 32 and len(self.nonce) == 8:
+                self.memoize_seal_hash(seal_hash_of(self.rlp()))
+            else:
+                self.memoize_seal_hash(keccak256(encode(self._fields())))
+        return self._seal_hash
+
+    def memoize_seal_hash(self, seal_hash: bytes) -> None:
+        """Record a seal hash computed elsewhere (e.g. by a verifier worker)."""
+        object.__setattr__(self, "_seal_hash", seal_hash)
+
+    def with_seal(self, mix_hash: bytes, nonce: bytes) -> "BlockHeader":
+        """Copy with a new seal; the seal hash carries over."""
+        sealed = replace(self, mix_hash=mix_hash, nonce=nonce)
+        object.__setattr__(sealed, "_seal_hash", self._seal_hash)
+        return sealed
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# block/importer.py
+#
+# Pipelined block import:
+#
+#   prepare (threads)   header checks, tx root, sender recovery for N+1, N+2 ...
+#   execute (caller)    transactions of N on State, state root check
+#   commit  (1 thread)  N's state diff and header written while N+1 executes
+#
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from ethereum_node.block.block import Block
+from ethereum_node.block.chain import HeaderChain
+from ethereum_node.block.header import BlockHeader
+from ethereum_node.block.ingest import InvalidTransaction, TxIngestor
+from ethereum_node.block.transaction import Transaction
+from ethereum_node.db.memory import MemoryDB
+from ethereum_node.state.account import Account
+from ethereum_node.state.state import EMPTY_CODE_HASH, State
+from ethereum_node.state.trie import EMPTY_ROOT, Trie
+from ethereum_node.utils.rlp import encode
+
+PREFETCH = 4            # blocks prepared ahead of the one executing
+MAX_PENDING_COMMITS = 2 # detached state diffs allowed in flight
+MAX_EXTRA_DATA = 32
+MIN_GAS_LIMIT = 5000
+GAS_LIMIT_BOUND_DIVISOR = 1024
+
+
+class BlockImportError(Exception):
+    pass
+
+
+@dataclass
+class PreparedBlock:
+    block: Block
+    transactions: List[Transaction]     # decoded, senders recovered
+
+
+def transactions_root(transactions: Iterable[bytes]) -> bytes:
+    """Root of the trie mapping rlp(index) -> raw transaction."""
+    trie = Trie(MemoryDB(), cache=None, deferred=True)
+    for index, raw in enumerate(transactions):
+        trie.update(encode(index), raw)
+    return trie.root_hash()
+
+
+def validate_header(header: BlockHeader, parent: BlockHeader) -> None:
+    """Checks that need only the header and its parent."""
+    if header.parent_hash != parent.hash():
+        raise BlockImportError(f"Block {header.number}: parent hash mismatch")
+    if header.number != parent.number + 1:
+        raise BlockImportError(f"Block {header.number}: expected number {parent.number + 1}")
+    if header.timestamp <= parent.timestamp:
+        raise BlockImportError(f"Block {header.number}: timestamp not after parent")
+    if header.gas_used > header.gas_limit:
+        raise BlockImportError(f"Block {header.number}: gas used above gas limit")
+    if header.gas_limit < MIN_GAS_LIMIT:
+        raise BlockImportError(f"Block {header.number}: gas limit below {MIN_GAS_LIMIT}")
+    if abs(header.gas_limit - parent.gas_limit) >= parent.gas_limit // GAS_LIMIT_BOUND_DIVISOR:
+        raise BlockImportError(f"Block {header.number}: gas limit changed too much")
+    if len(header.extra_data) > MAX_EXTRA_DATA:
+        raise BlockImportError(f"Block {header.number}: extra data too long")
+
+
+def apply_transaction(state: State, tx: Transaction, coinbase: bytes) -> int:
+    """Apply a value transfer and its fee; return the gas used.
+
+    Only plain transfers are executed: the EVM is not wired to State yet,
+    so a transaction is charged its intrinsic gas and moves `value`.
+    """
+    sender = state.get_account(tx.sender)
+    if sender is None or sender.nonce != tx.nonce:
+        raise BlockImportError(f"Transaction {tx.hash().hex()}: bad nonce")
+    if sender.balance < tx.value + tx.gas * tx.gas_price:
+        raise BlockImportError(f"Transaction {tx.hash().hex()}: insufficient funds")
+    gas_used = tx.intrinsic_gas()
+    fee = gas_used * tx.gas_price
+    state.set_account(tx.sender, replace(sender, nonce=sender.nonce + 1, balance=sender.balance - tx.value - fee))
+    for address, amount in ((tx.to, tx.value), (coinbase, fee)):
+        if address and amount:
+            account = state.get_account(address) or Account(0, 0, EMPTY_ROOT, EMPTY_CODE_HASH)
+            state.set_account(address, replace(account, balance=account.balance + amount))
+    return gas_used
+
+
+def _wait_commits(commits: Iterable[Future]) -> Optional[BaseException]:
+    """Wait for every commit; return the first one's error, if any."""
+    wait(commits)
+    for future in commits:
+        if future.exception() is not None:
+            return future.exception()
+    return None
+
+
+def _with_parents(blocks: Iterable[Block], parent: BlockHeader) -> Iterator[Tuple[Block, BlockHeader]]:
+    for block in blocks:
+        yield block, parent
+        parent = block.header
+
+
+class BlockImporter:
+    """Import a chain segment as a three-stage pipeline.
+
+    Python threads cannot hash or execute in parallel, so the stages
+    overlap what does release the GIL: sender recovery (a process pool
+    inside TxIngestor) and database writes. Each block's state writes are
+    detached from the State as a frozen diff, the copy-on-write layer the
+    next block executes on, and stored by the commit thread along with
+    the header. The backing DB must allow use from another thread.
+    """
+
+    def __init__(
+        self,
+        state: State,
+        chain: HeaderChain,
+        ingestor: Optional[TxIngestor] = None,
+        workers: int = 2,
+    ):
+        self.state = state
+        self.chain = chain
+        self._owns_ingestor = ingestor is None
+        self.ingestor = ingestor or TxIngestor()
+        self.workers = workers
+
+    def import_blocks(self, blocks: Iterable[Block]) -> List[bytes]:
+        """Import blocks in order on top of the current head; return their hashes.
+
+        On a failure, blocks before the bad one stay imported and the
+        error is raised once all their commits have finished; a commit
+        that failed as well is chained to it.
+        """
+        parent = self.chain.head
+        if parent is None:
+            raise BlockImportError("Header chain has no head")
+        imported: List[bytes] = []
+        commits: Deque[Future] = deque()
+        pairs = _with_parents(blocks, parent)
+        with ThreadPoolExecutor(self.workers) as prepare, ThreadPoolExecutor(1) as commit:
+            try:
+                prepared: Deque[Future] = deque()
+                self._fill(prepared, prepare, pairs)
+                while prepared:
+                    ready = prepared.popleft().result()
+                    self._fill(prepared, prepare, pairs)
+                    self._execute(ready)
+                    dirty = self.state.detach()
+                    commits.append(commit.submit(self._commit, dirty, ready.block.header))
+                    while len(commits) > MAX_PENDING_COMMITS:
+                        commits.popleft().result()
+                    imported.append(ready.block.hash())
+            except BaseException as exc:
+                commit_error = _wait_commits(commits)
+                if commit_error is not None:
+                    if exc.__cause__ is None:
+                        exc.__cause__ = commit_error
+                    else:
+                        exc.add_note(f"Committing an earlier block also failed: {commit_error!r}")
+                raise
+            commit_error = _wait_commits(commits)
+            if commit_error is not None:
+                raise commit_error
+        return imported
+
+    def close(self):
+        if self._owns_ingestor:
+            self.ingestor.close()
+
+    def _fill(self, prepared: Deque[Future], pool: ThreadPoolExecutor, pairs) -> None:
+        while len(prepared) < PREFETCH:
+            pair = next(pairs, None)
+            if pair is None:
+                return
+            prepared.append(pool.submit(self._prepare, *pair))
+
+    def _prepare(self, block: Block, parent: BlockHeader) -> PreparedBlock:
+        """Stateless checks; runs ahead of execution on a worker thread."""
+        header = block.header
+        validate_header(header, parent)
+        if transactions_root(block.transactions) != header.transactions_root:
+            raise BlockImportError(f"Block {header.number}: transactions root mismatch")
+        try:
+            txs = self.ingestor.ingest(block.transactions)
+        except InvalidTransaction as exc:
+            raise BlockImportError(f"Block {header.number}: {exc}") from exc
+        return PreparedBlock(block, txs)
+
+    def _execute(self, ready: PreparedBlock) -> None:
+        header = ready.block.header
+        snap = self.state.snapshot()
+        try:
+            gas_used = 0
+            for tx in ready.transactions:
+                if tx.gas > header.gas_limit - gas_used:
+                    raise BlockImportError(
+                        f"Block {header.number}: transaction {tx.hash().hex()} gas above the block's remaining gas"
+                    )
+                gas_used += apply_transaction(self.state, tx, header.coinbase)
+            if gas_used != header.gas_used:
+                raise BlockImportError(f"Block {header.number}: gas used {gas_used} != {header.gas_used}")
+            if self.state.state_root() != header.state_root:
+                raise BlockImportError(f"Block {header.number}: state root mismatch")
+        except BaseException:
+            self.state.revert(snap)     # never leave a half-applied block behind
+            raise
+
+    def _commit(self, dirty, header: BlockHeader) -> None:
+        self.state.journal.db.apply_batch(dirty)
+        self.state.journal.release(dirty)
+        self.chain.add_header(header, canonical=True)
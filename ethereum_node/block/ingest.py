@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# block/ingest.py
+#
+# Raw transaction bytes -> decoded, pre-validated transactions with senders.
+#
+
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from ethereum_node.block.transaction import InvalidTransaction, Transaction
+from ethereum_node.utils.hash import keccak256
+from ethereum_node.utils.lru import LRUCache
+from ethereum_node.utils.secp256k1 import N, recover_public_key
+
+SENDER_CACHE_SIZE = 100_000     # recovered senders kept by tx hash
+PARALLEL_THRESHOLD = 32         # smaller batches are recovered in-process
+CHUNK_SIZE = 64                 # transactions per worker task
+
+Signature = Tuple[bytes, int, int, int]  # (signing hash, recovery id, r, s)
+
+
+def _recover_batch(signatures: Sequence[Signature]) -> List[Optional[bytes]]:
+    """Worker entry point: recover one sender address per signature."""
+    senders: List[Optional[bytes]] = []
+    for msg_hash, recovery_id, r, s in signatures:
+        public_key = recover_public_key(msg_hash, recovery_id, r, s)
+        senders.append(keccak256(public_key)[12:] if public_key else None)
+    return senders
+
+
+def check_transaction(tx: Transaction, chain_id: Optional[int] = None) -> None:
+    """Stateless checks: intrinsic gas and signature shape (EIP-2 low s, EIP-155)."""
+    if tx.gas < tx.intrinsic_gas():
+        raise InvalidTransaction(f"Intrinsic gas too low: {tx.gas} < {tx.intrinsic_gas()}")
+    if not (0 < tx.r < N and 0 < tx.s <= N // 2):
+        raise InvalidTransaction("Invalid signature values")
+    tx_chain_id = tx.chain_id             # raises for a malformed v
+    if tx_chain_id is not None and chain_id is not None and tx_chain_id != chain_id:
+        raise InvalidTransaction(f"Wrong chain id in v: {tx.v}")
+
+
+class TxIngestor:
+    """Decode, pre-validate and recover senders for raw transactions.
+
+    Sender recovery is CPU-bound, so batches of at least
+    PARALLEL_THRESHOLD new signatures are spread over a process pool.
+    Recovered senders are cached by transaction hash, so the tx pool,
+    block validation and RPC never pay for the same signature twice.
+    """
+
+    def __init__(
+        self,
+        chain_id: Optional[int] = None,
+        workers: Optional[int] = None,
+        cache_size: int = SENDER_CACHE_SIZE,
+        executor: Optional[Executor] = None,
+    ):
+        self.chain_id = chain_id
+        self.workers = workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._senders = LRUCache(cache_size)
+        self._lock = threading.Lock()
+
+    def process(self, raw_txs: Iterable[bytes]) -> List[Union[Transaction, InvalidTransaction]]:
+        """One result per input, in order: a Transaction with `sender` set,
+        or the InvalidTransaction explaining why it was rejected."""
+        results: List[Union[Transaction, InvalidTransaction]] = []
+        todo: List[Tuple[int, Transaction]] = []
+        for raw in raw_txs:
+            try:
+                tx = Transaction.from_rlp(raw)
+                check_transaction(tx, self.chain_id)
+            except InvalidTransaction as exc:
+                results.append(exc)
+                continue
+            except (ValueError, TypeError) as exc:
+                results.append(InvalidTransaction(f"Malformed transaction: {exc}"))
+                continue
+            with self._lock:
+                sender = self._senders.get(tx.hash())
+            if sender is None:
+                todo.append((len(results), tx))
+            else:
+                tx = tx.with_sender(sender)
+            results.append(tx)
+
+        if todo:
+            senders = self._recover([tx for _, tx in todo])
+            with self._lock:
+                for (index, tx), sender in zip(todo, senders):
+                    if sender is None:
+                        results[index] = InvalidTransaction("Unrecoverable signature")
+                    else:
+                        results[index] = tx.with_sender(sender)
+                        self._senders.put(tx.hash(), sender)
+        return results
+
+    def ingest(self, raw_txs: Iterable[bytes]) -> List[Transaction]:
+        """Like process(), but all-or-nothing: raise on the first invalid tx."""
+        txs = []
+        for index, result in enumerate(self.process(raw_txs)):
+            if isinstance(result, InvalidTransaction):
+                raise InvalidTransaction(f"Transaction {index}: {result}")
+            txs.append(result)
+        return txs
+
+    def sender_of(self, tx: Transaction) -> Optional[bytes]:
+        """Sender of an already decoded transaction, recovered at most once."""
+        if tx.sender is not None:
+            return tx.sender
+        with self._lock:
+            sender = self._senders.get(tx.hash())
+        if sender is None:
+            sender = self._recover([tx])[0]
+            if sender is not None:
+                with self._lock:
+                    self._senders.put(tx.hash(), sender)
+        return sender
+
+    def _recover(self, txs: List[Transaction]) -> List[Optional[bytes]]:
+        signatures = [(tx.signing_hash(), tx.recovery_id, tx.r, tx.s) for tx in txs]
+        if len(signatures) < PARALLEL_THRESHOLD:
+            return _recover_batch(signatures)
+        chunks = [signatures[i : i + CHUNK_SIZE] for i in range(0, len(signatures), CHUNK_SIZE)]
+        senders: List[Optional[bytes]] = []
+        for batch in self._pool().map(_recover_batch, chunks):
+            senders.extend(batch)
+        return senders
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "TxIngestor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass, field, replace
+from typing import Optional
+from ethereum_node.evm.gas import GTRANSACTION, GTXCREATE, GTXDATANONZERO, GTXDATAZERO
+from ethereum_node.utils.rlp import decode, encode
+from ethereum_node.utils.hash import keccak256
+from ethereum_node.utils.secp256k1 import recover_public_key
+
+
+class InvalidTransaction(Exception):
+    pass
+
+
+def _check_v(v: int) -> None:
+    if v not in (27, 28) and v < 35:
+        raise InvalidTransaction(f"Invalid v: {v}")
+
+
+@dataclass(slots=True, frozen=True)
+class Transaction:
+    """Legacy (pre-typed) transaction; `to` is b"" for contract creation.
+
+    Immutable like BlockHeader; with_sender() attaches a recovered sender.
+    """
+
+    nonce: int
+    gas_price: int
+    gas: int
+    to: bytes
+    value: int
+    data: bytes
+    v: int = 0
+    r: int = 0
+    s: int = 0
+    sender: Optional[bytes] = field(default=None, compare=False)  # recovered, not encoded
+    _rlp: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _hash: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_rlp(cls, encoded: bytes) -> "Transaction":
+        fields = decode(encoded)
+        if len(fields) != 9:
+            raise ValueError(f"Transaction has {len(fields)} fields, expected 9")
+        nonce, gas_price, gas, to, value, data, v, r, s = fields
+        _check_v(int.from_bytes(v, "big"))
+        tx = cls(
+            int.from_bytes(nonce, "big"),
+            int.from_bytes(gas_price, "big"),
+            int.from_bytes(gas, "big"),
+            to,
+            int.from_bytes(value, "big"),
+            data,
+            int.from_bytes(v, "big"),
+            int.from_bytes(r, "big"),
+            int.from_bytes(s, "big"),
+        )
+        object.__setattr__(tx, "_rlp", bytes(encoded))
+        return tx
+
+    def rlp(self) -> bytes:
+        if self._rlp is None:
+            object.__setattr__(self, "_rlp", encode([
+                self.nonce,
+                self.gas_price,
+                self.gas,
+                self.to,
+                self.value,
+                self.data,
+                self.v,
+                self.r,
+                self.s,
+            ]))
+        return self._rlp
+
+    def hash(self) -> bytes:
+        if self._hash is None:
+            object.__setattr__(self, "_hash", keccak256(self.rlp()))
+        return self._hash
+
+    def with_sender(self, sender: Optional[bytes]) -> "Transaction":
+        """Copy carrying `sender`; the cached encoding and hash carry over."""
+        tx = replace(self, sender=sender)
+        object.__setattr__(tx, "_rlp", self._rlp)
+        object.__setattr__(tx, "_hash", self._hash)
+        return tx
+
+    @property
+    def chain_id(self) -> Optional[int]:
+        """EIP-155 chain id, or None for a pre-EIP-155 signature (v = 27/28)."""
+        if self.v in (27, 28):
+            return None
+        _check_v(self.v)
+        return (self.v - 35) // 2
+
+    @property
+    def recovery_id(self) -> int:
+        return (self.v - 27) if self.v in (27, 28) else (self.v - 35) % 2
+
+    def signing_hash(self) -> bytes:
+        fields = [self.nonce, self.gas_price, self.gas, self.to, self.value, self.data]
+        chain_id = self.chain_id
+        if chain_id is not None:
+            fields += [chain_id, 0, 0]
+        return keccak256(encode(fields))
+
+    def intrinsic_gas(self) -> int:
+        zeros = self.data.count(0)
+        gas = GTRANSACTION + zeros * GTXDATAZERO + (len(self.data) - zeros) * GTXDATANONZERO
+        if not self.to:
+            gas += GTXCREATE
+        return gas
+
+    def recover_sender(self) -> Optional[bytes]:
+        """Address that signed this transaction, or None for a bad signature."""
+        public_key = recover_public_key(self.signing_hash(), self.recovery_id, self.r, self.s)
+        return keccak256(public_key)[12:] if public_key else None
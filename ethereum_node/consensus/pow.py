@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# consensus/pow.py
+#
+# Constant-difficulty proof of work: a header is sealed when
+# keccak256(seal_hash || nonce) <= 2**256 // difficulty, where the seal
+# hash covers every header field but mix_hash and nonce.
+#
+
+import multiprocessing
+import struct
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from typing import List, Optional, Sequence, Set, Tuple
+
+from ethereum_node.block.header import BlockHeader, seal_hash_of
+from ethereum_node.utils.hash import keccak256
+
+NONCE_SIZE = 8
+MAX_NONCE = 2**64
+CHUNK_SIZE = 1 << 16            # nonces per worker task
+CANCEL_CHECK_INTERVAL = 1 << 12  # attempts between checks of the cancel flag
+VERIFY_CHUNK_SIZE = 256         # headers per verification task
+VERIFY_PARALLEL_THRESHOLD = 512 # smaller batches are verified in-process
+
+# (seal hash, or the header encoding to derive it from; nonce; difficulty)
+SealWork = Tuple[Optional[bytes], Optional[bytes], bytes, int]
+
+_cancel = None                  # per-worker multiprocessing.Event, see _init_worker
+
+
+def pow_target(difficulty: int) -> int:
+    if difficulty <= 0:
+        raise ValueError(f"Invalid difficulty: {difficulty}")
+    return 2**256 // difficulty
+
+
+class InvalidSeal(Exception):
+    def __init__(self, index: int, header: BlockHeader):
+        super().__init__(f"Header {header.number} (batch index {index}) fails proof of work")
+        self.index = index
+        self.header = header
+
+
+def _seal_ok(seal_hash: bytes, nonce: bytes, difficulty: int) -> bool:
+    return difficulty > 0 and int.from_bytes(keccak256(seal_hash + nonce), "big") <= 2**256 // difficulty
+
+
+def check_pow(header: BlockHeader) -> bool:
+    return _seal_ok(header.seal_hash(), header.nonce, header.difficulty)
+
+
+def _verify_batch(work: Sequence[SealWork]) -> Tuple[List[bytes], Optional[int]]:
+    """Worker entry point: check seals in order, stopping at the first bad one.
+
+    Returns the seal hashes derived so far, for the caller to memoize, and
+    the offset of the bad seal or None.
+    """
+    seal_hashes = []
+    for offset, (seal_hash, encoded, nonce, difficulty) in enumerate(work):
+        if seal_hash is None:
+            seal_hash = seal_hash_of(encoded)
+        seal_hashes.append(seal_hash)
+        if not _seal_ok(seal_hash, nonce, difficulty):
+            return seal_hashes, offset
+    return seal_hashes, None
+
+
+def _init_worker(cancel):
+    global _cancel
+    _cancel = cancel
+
+
+def _search(seal_hash: bytes, start: int, count: int, target: int) -> Tuple[Optional[int], int]:
+    """Worker entry point: try nonces start .. start + count - 1.
+
+    Each attempt overwrites the last 8 bytes of one seal_hash || nonce
+    buffer and hashes it. Returns (nonce or None, attempts made).
+    """
+    buf = bytearray(seal_hash + bytes(NONCE_SIZE))
+    offset = len(seal_hash)
+    pack = struct.pack_into
+    for attempts, nonce in enumerate(range(start, min(start + count, MAX_NONCE))):
+        if attempts % CANCEL_CHECK_INTERVAL == 0 and _cancel is not None and _cancel.is_set():
+            return None, attempts
+        pack(">Q", buf, offset, nonce)
+        if int.from_bytes(keccak256(buf), "big") <= target:
+            return nonce, attempts + 1
+    return None, min(start + count, MAX_NONCE) - start
+
+
+class PoWMiner:
+    """Nonce search split across a process pool.
+
+    Nonces are handed out in CHUNK_SIZE slices, one in flight per worker.
+    The first worker to find a seal stops the rest through a shared
+    event; cancel() uses the same event to abandon a search when a new
+    head arrives.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.hashes = 0                 # attempts in the last search
+        self.elapsed = 0.0              # seconds spent in the last search
+        self._cancel = multiprocessing.Event()
+        self._cancelled = threading.Event()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def hashrate(self) -> float:
+        """Hashes per second over the last search."""
+        return self.hashes / self.elapsed if self.elapsed else 0.0
+
+    def mine(self, header: BlockHeader, start_nonce: int = 0) -> Optional[BlockHeader]:
+        """Search for a nonce sealing `header`.
+
+        Returns the sealed copy of the header, or None if cancel() was
+        called or the nonce space ran out.
+        """
+        seal_hash = header.seal_hash()
+        target = pow_target(header.difficulty)
+        self._cancel.clear()
+        self._cancelled.clear()
+        self.hashes = 0
+        started = time.perf_counter()
+
+        pool = self._pool()
+        running: Set[Future] = set()
+        next_nonce = start_nonce
+        found: Optional[int] = None
+        try:
+            while True:
+                while (
+                    found is None
+                    and not self._cancelled.is_set()
+                    and len(running) < self.workers
+                    and next_nonce < MAX_NONCE
+                ):
+                    future = pool.submit(_search, seal_hash, next_nonce, self.chunk_size, target)
+                    running.add(future)
+                    next_nonce += self.chunk_size
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.discard(future)
+                    nonce, attempts = future.result()
+                    self.hashes += attempts
+                    if nonce is not None:
+                        found = nonce if found is None else min(found, nonce)
+                        self._cancel.set()
+        finally:
+            if running:
+                self._cancel.set()
+                for future in running:
+                    self.hashes += future.result()[1]
+            self.elapsed = time.perf_counter() - started
+
+        if found is None or self._cancelled.is_set():
+            return None
+        return header.with_seal(header.mix_hash, found.to_bytes(NONCE_SIZE, "big"))
+
+    def cancel(self):
+        """Abandon the current search; mine() returns None."""
+        self._cancelled.set()
+        self._cancel.set()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self._cancel,)
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "PoWMiner":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PoWVerifier:
+    """Seal checks for header batches, spread over a process pool.
+
+    Headers go out in VERIFY_CHUNK_SIZE slices. A header whose seal hash
+    is not memoized yet ships its encoding, the worker derives the hash
+    by slicing, and the result is memoized on the header on return.
+    Once a slice reports a bad seal, slices after it are cancelled; the
+    error names the first bad header of the batch.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = VERIFY_CHUNK_SIZE,
+        executor: Optional[Executor] = None,
+    ):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def verify_headers(self, headers: Sequence[BlockHeader]) -> None:
+        """Raise InvalidSeal for the first header in `headers` with a bad seal."""
+        work = [self._work(header) for header in headers]
+        if len(work) < VERIFY_PARALLEL_THRESHOLD:
+            self._finish(headers, 0, *_verify_batch(work))
+            return
+
+        size = self.chunk_size
+        pool = self._pool()
+        pending = {pool.submit(_verify_batch, work[i : i + size]): i for i in range(0, len(work), size)}
+        bad: Optional[int] = None
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start = pending.pop(future, None)
+                    if start is None or future.cancelled():
+                        continue                # dropped after a bad seal earlier in `done`
+                    seal_hashes, offset = future.result()
+                    self._finish(headers, start, seal_hashes, None)
+                    if offset is not None and (bad is None or start + offset < bad):
+                        bad = start + offset
+                        for later in [f for f, s in pending.items() if s > bad]:
+                            later.cancel()
+                            del pending[later]
+        finally:
+            for future in pending:
+                future.cancel()
+        if bad is not None:
+            raise InvalidSeal(bad, headers[bad])
+
+    @staticmethod
+    def _work(header: BlockHeader) -> SealWork:
+        if header._seal_hash is None and len(header.mix_hash) == 32 and len(header.nonce) == NONCE_SIZE:
+            return None, header.rlp(), header.nonce, header.difficulty
+        return header.seal_hash(), None, header.nonce, header.difficulty
+
+    @staticmethod
+    def _finish(headers, start: int, seal_hashes: List[bytes], offset: Optional[int]) -> None:
+        for header, seal_hash in zip(headers[start:], seal_hashes):
+            header.memoize_seal_hash(seal_hash)
+        if offset is not None:
+            raise InvalidSeal(start + offset, headers[start + offset])
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "PoWVerifier":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# db/base.py
+#
+# Backend-independent key/value interface.
+#
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+class WriteBatch:
+    """Puts and deletes collected in memory and applied in one transaction.
+
+    Later operations on a key replace earlier ones, so each key is written
+    at most once. Used as a context manager, the batch is applied on a
+    clean exit and discarded if the block raises.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._ops: Dict[bytes, Optional[bytes]] = {}
+
+    def put(self, key: bytes, value: bytes):
+        self._ops[key] = value
+
+    def delete(self, key: bytes):
+        self._ops[key] = None
+
+    def commit(self):
+        if self._ops:
+            self.db.apply_batch(self._ops)
+            self._ops = {}
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __enter__(self) -> "WriteBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+
+
+class BaseSnapshot(ABC):
+    """Read-only, point-in-time view of a backend.
+
+    Writes made to the backend after the snapshot was taken are not
+    visible through it. Release it with close() or a `with` block.
+    """
+
+    @abstractmethod
+    def get(self, key: bytes) -> Optional[bytes]:
+        ...
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+        return {key: self.get(key) for key in keys}
+
+    @abstractmethod
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        ...
+
+    @abstractmethod
+    def close(self):
+        ...
+
+    def __enter__(self) -> "BaseSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BaseKV(ABC):
+    """Key/value store used for trie nodes and chain data.
+
+    Backends implement single-key reads and writes, ordered prefix
+    iteration and snapshots; multi-get and batches fall back to loops
+    over the single-key operations unless a backend can do better.
+    """
+
+    @abstractmethod
+    def get(self, key: bytes) -> Optional[bytes]:
+        ...
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+        """Every requested key is present in the result; missing ones map to None."""
+        return {key: self.get(key) for key in keys}
+
+    @abstractmethod
+    def put(self, key: bytes, value: bytes):
+        ...
+
+    @abstractmethod
+    def delete(self, key: bytes):
+        ...
+
+    def write_batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    def apply_batch(self, ops: Dict[bytes, Optional[bytes]]):
+        """Apply key -> value (None = delete) as one unit."""
+        for key, value in ops.items():
+            if value is None:
+                self.delete(key)
+            else:
+                self.put(key, value)
+
+    @abstractmethod
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        """Yield (key, value) for keys starting with `prefix`, in key order."""
+
+    @abstractmethod
+    def snapshot(self) -> BaseSnapshot:
+        ...
+
+    def close(self):
+        pass
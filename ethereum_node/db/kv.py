@@ -2,14 +2,92 @@
 # db/kv.py
 
 import sqlite3
-from typing import Optional
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
+from ethereum_node.db.base import BaseKV, BaseSnapshot
+
+CACHE_KIB = 64 * 1024  # sqlite page cache per connection
+MAX_QUERY_KEYS = 500   # bound parameters per IN (...) query
+
+
+def _select_many(conn: sqlite3.Connection, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+    """Fetch keys with one IN (...) query per MAX_QUERY_KEYS keys."""
+    found: Dict[bytes, Optional[bytes]] = dict.fromkeys(keys)
+    pending = list(found)
+    for i in range(0, len(pending), MAX_QUERY_KEYS):
+        chunk = pending[i : i + MAX_QUERY_KEYS]
+        marks = ",".join("?" * len(chunk))
+        cursor = conn.execute(f"SELECT k, v FROM kv WHERE k IN ({marks})", chunk)
+        found.update(cursor.fetchall())
+    return found
+
+
+def _prefix_end(prefix: bytes) -> Optional[bytes]:
+    """Smallest key above every key starting with `prefix`; None if unbounded."""
+    stripped = prefix.rstrip(b"\xff")
+    if not stripped:
+        return None
+    return stripped[:-1] + bytes([stripped[-1] + 1])
+
+
+def _select_prefix(conn: sqlite3.Connection, prefix: bytes) -> Iterator[Tuple[bytes, bytes]]:
+    """Rows whose key starts with `prefix`, in key order, read off the cursor."""
+    end = _prefix_end(prefix)
+    if end is None:
+        return iter(conn.execute("SELECT k, v FROM kv WHERE k >= ? ORDER BY k", (prefix,)))
+    return iter(conn.execute("SELECT k, v FROM kv WHERE k >= ? AND k < ? ORDER BY k", (prefix, end)))
+
+
+class SQLiteSnapshot(BaseSnapshot):
+    """A read transaction on a second connection.
+
+    In WAL mode the transaction keeps seeing the database as of its first
+    read, however much the main connection writes afterwards.
+    """
 
-class KeyValueDB:
     def __init__(self, path: str):
-        self.conn = sqlite3.connect(path)
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("BEGIN")
+        self.conn.execute("SELECT COUNT(*) FROM kv").fetchone()  # pin the snapshot
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        row = self.conn.execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+        return _select_many(self.conn, keys)
+
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        return _select_prefix(self.conn, prefix)
+
+    def close(self):
+        self.conn.execute("COMMIT")
+        self.conn.close()
+
+
+class KeyValueDB(BaseKV):
+    """sqlite3-backed store: one `kv` table keyed by BLOB.
+
+    The connection may be shared between threads (e.g. a background
+    committer); a lock serialises its use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._configure()
         self._create_table()
 
+    def _configure(self):
+        # WAL lets readers run alongside the writer and turns each commit
+        # into a sequential log append; NORMAL only syncs at checkpoints.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
     def _create_table(self):
         with self.conn:
             self.conn.execute(
@@ -17,17 +95,45 @@ class KeyValueDB:
             )
 
     def get(self, key: bytes) -> Optional[bytes]:
-        cursor = self.conn.execute("SELECT v FROM kv WHERE k = ?", (key,))
-        row = cursor.fetchone()
+        with self._lock:
+            row = self.conn.execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
         return row[0] if row else None
 
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+        """Fetch several keys with one IN (...) query per MAX_QUERY_KEYS keys.
+
+        Every requested key is present in the result; missing ones map to None.
+        """
+        with self._lock:
+            return _select_many(self.conn, keys)
+
     def put(self, key: bytes, value: bytes):
-        with self.conn:
+        with self._lock, self.conn:
             self.conn.execute("INSERT OR REPLACE INTO kv (k, v) VALUES (?, ?)", (key, value))
 
     def delete(self, key: bytes):
-        with self.conn:
+        with self._lock, self.conn:
             self.conn.execute("DELETE FROM kv WHERE k = ?", (key,))
 
+    def apply_batch(self, ops: Dict[bytes, Optional[bytes]]):
+        """Apply key -> value (None = delete) in a single transaction."""
+        puts = [(k, v) for k, v in ops.items() if v is not None]
+        deletes = [(k,) for k, v in ops.items() if v is None]
+        with self._lock, self.conn:
+            if puts:
+                self.conn.executemany("INSERT OR REPLACE INTO kv (k, v) VALUES (?, ?)", puts)
+            if deletes:
+                self.conn.executemany("DELETE FROM kv WHERE k = ?", deletes)
+
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        # Rows are fetched up front so the caller may write while iterating.
+        with self._lock:
+            rows = list(_select_prefix(self.conn, prefix))
+        return iter(rows)
+
+    def snapshot(self) -> SQLiteSnapshot:
+        """Consistent read view; needs a file-backed database, not ':memory:'."""
+        return SQLiteSnapshot(self.path)
+
     def close(self):
         self.conn.close()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# db/logdb.py
+#
+# Append-only log with a memory-mapped hash index.
+#
+# <dir>/data.log   header | record | record | ...
+#                  record = key length u32, value length u32, key, value
+# <dir>/data.idx   header | slot * capacity
+#                  slot   = key fingerprint u64, record offset u64 (0 = empty)
+#
+# Records are never rewritten, so a value can be served as a memoryview
+# straight out of the log mapping. The index is an open-addressing table
+# with linear probing; a key's slot always points at its newest record,
+# and deletes append a tombstone record. Space is not reclaimed.
+#
+
+import hashlib
+import mmap
+import os
+import struct
+import weakref
+from typing import Dict, Iterator, Optional, Tuple
+
+from ethereum_node.db.base import BaseKV, BaseSnapshot
+
+LOG_MAGIC = b"ENLOG001"
+IDX_MAGIC = b"ENIDX001"
+LOG_HEADER = struct.Struct("<8sQ")      # magic, end of last committed record
+IDX_HEADER = struct.Struct("<8sQQQ")    # magic, log end covered, capacity, used slots
+SLOT = struct.Struct("<QQ")
+RECORD = struct.Struct("<II")
+TOMBSTONE = 0xFFFFFFFF                  # value length of a delete record
+
+INITIAL_LOG_BYTES = 1 << 20
+INITIAL_SLOTS = 1 << 12                 # power of two
+MAX_LOAD = 0.5                          # used slots / capacity before doubling
+
+
+def _fingerprint(key: bytes) -> int:
+    # Stable across processes, unlike hash(); never 0 so it can't look empty.
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") | 1
+
+
+def _map(path: str, size: int) -> Tuple[int, mmap.mmap]:
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if os.fstat(fd).st_size < size:
+        os.ftruncate(fd, size)
+    return fd, mmap.mmap(fd, max(size, os.fstat(fd).st_size))
+
+
+class LogDB(BaseKV):
+    """Memory-mapped store tuned for point reads of immutable values.
+
+    A lookup is one fingerprint probe in the index plus a key compare in
+    the log, with no syscalls. `get_view` returns the value without
+    copying; views stay valid after later writes. Set `sync=True` to msync
+    both files at the end of every batch.
+    """
+
+    def __init__(self, path: str, sync: bool = False):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.sync = sync
+        self._snapshots: "weakref.WeakSet[LogSnapshot]" = weakref.WeakSet()
+        self._open_log(os.path.join(path, "data.log"))
+        self._open_index(os.path.join(path, "data.idx"))
+
+    # ── reads ─────────────────────────────────────────────────────────
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._value_at(self._lookup(key)[1])
+
+    def get_view(self, key: bytes) -> Optional[memoryview]:
+        """Zero-copy read: a view into the log mapping, or None."""
+        off = self._lookup(key)[1]
+        if not off:
+            return None
+        klen, vlen = RECORD.unpack_from(self._log, off)
+        if vlen == TOMBSTONE:
+            return None
+        start = off + RECORD.size + klen
+        return memoryview(self._log)[start : start + vlen]
+
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        """Ordered by key; the index is unordered, so this sorts every match."""
+        return self._iterate(self._offsets(prefix))
+
+    def snapshot(self) -> "LogSnapshot":
+        return LogSnapshot(self)
+
+    # ── writes ────────────────────────────────────────────────────────
+
+    def put(self, key: bytes, value: bytes):
+        self.apply_batch({key: value})
+
+    def delete(self, key: bytes):
+        self.apply_batch({key: None})
+
+    def apply_batch(self, ops: Dict[bytes, Optional[bytes]]):
+        """Append every record, then publish the new log end in one write.
+
+        The index header is marked stale while slots change; a crash before
+        the final header write makes the next open rebuild the index.
+        """
+        if not ops:
+            return
+        IDX_HEADER.pack_into(self._idx, 0, IDX_MAGIC, 0, self._capacity, self._used)
+        for key, value in ops.items():
+            self._index_put(key, self._append(key, value))
+        LOG_HEADER.pack_into(self._log, 0, LOG_MAGIC, self._end)
+        IDX_HEADER.pack_into(self._idx, 0, IDX_MAGIC, self._end, self._capacity, self._used)
+        if self.sync:
+            self._log.flush()
+            self._idx.flush()
+
+    def close(self):
+        self._log.flush()
+        self._idx.flush()
+        self._idx.close()
+        try:
+            self._log.close()
+        except BufferError:
+            pass  # views from get_view keep the mapping alive until released
+        os.close(self._log_fd)
+        os.close(self._idx_fd)
+
+    # ── log ───────────────────────────────────────────────────────────
+
+    def _open_log(self, path: str):
+        self._log_fd, self._log = _map(path, INITIAL_LOG_BYTES)
+        magic, end = LOG_HEADER.unpack_from(self._log, 0)
+        if magic != LOG_MAGIC:
+            if magic.strip(b"\0"):
+                raise ValueError(f"{path} is not a LogDB log")
+            end = LOG_HEADER.size
+            LOG_HEADER.pack_into(self._log, 0, LOG_MAGIC, end)
+        self._end = end
+
+    def _append(self, key: bytes, value: Optional[bytes]) -> int:
+        off = self._end
+        vlen = TOMBSTONE if value is None else len(value)
+        end = off + RECORD.size + len(key) + (0 if value is None else vlen)
+        if end > len(self._log):
+            self._grow_log(end)
+        log = self._log
+        RECORD.pack_into(log, off, len(key), vlen)
+        start = off + RECORD.size
+        log[start : start + len(key)] = key
+        if value is not None:
+            log[start + len(key) : end] = value
+        self._end = end
+        return off
+
+    def _grow_log(self, needed: int):
+        size = max(needed, 2 * len(self._log))
+        os.ftruncate(self._log_fd, size)
+        # The old mapping is not closed: outstanding views may still use it.
+        self._log = mmap.mmap(self._log_fd, size)
+
+    def _key_at(self, off: int) -> bytes:
+        klen = RECORD.unpack_from(self._log, off)[0]
+        start = off + RECORD.size
+        return self._log[start : start + klen]
+
+    def _value_at(self, off: int) -> Optional[bytes]:
+        if not off:
+            return None
+        klen, vlen = RECORD.unpack_from(self._log, off)
+        if vlen == TOMBSTONE:
+            return None
+        start = off + RECORD.size + klen
+        return self._log[start : start + vlen]
+
+    def _records(self, start: int) -> Iterator[Tuple[bytes, int]]:
+        log = self._log
+        off = start
+        while off < self._end:
+            klen, vlen = RECORD.unpack_from(log, off)
+            key = log[off + RECORD.size : off + RECORD.size + klen]
+            yield key, off
+            off += RECORD.size + klen + (0 if vlen == TOMBSTONE else vlen)
+
+    # ── index ─────────────────────────────────────────────────────────
+
+    def _open_index(self, path: str):
+        self._idx_path = path
+        self._idx_fd, self._idx = _map(path, IDX_HEADER.size + INITIAL_SLOTS * SLOT.size)
+        magic, covered, capacity, used = IDX_HEADER.unpack_from(self._idx, 0)
+        self._capacity, self._used = capacity, used
+        if magic != IDX_MAGIC or covered != self._end:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Write a fresh index for the whole log, sized for its live keys."""
+        latest = {key: off for key, off in self._records(LOG_HEADER.size)}
+        capacity = INITIAL_SLOTS
+        while len(latest) > capacity * MAX_LOAD:
+            capacity *= 2
+        self._resize(capacity, latest)
+
+    def _resize(self, capacity: int, entries: Optional[Dict[bytes, int]] = None):
+        """Move to a table of `capacity` slots, filled from `entries` or the old table."""
+        old_idx, old_fd, old_capacity = self._idx, self._idx_fd, self._capacity
+        tmp = self._idx_path + ".tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        self._idx_fd, self._idx = _map(tmp, IDX_HEADER.size + capacity * SLOT.size)
+        self._capacity, self._used = capacity, 0
+        if entries is not None:
+            for key, off in entries.items():
+                self._insert_new(_fingerprint(key), off)
+        else:
+            for i in range(old_capacity):
+                fp, off = SLOT.unpack_from(old_idx, IDX_HEADER.size + i * SLOT.size)
+                if off:
+                    self._insert_new(fp, off)
+        IDX_HEADER.pack_into(self._idx, 0, IDX_MAGIC, self._end, self._capacity, self._used)
+        old_idx.close()
+        os.close(old_fd)
+        os.replace(tmp, self._idx_path)
+
+    def _lookup(self, key: bytes, fp: int = 0) -> Tuple[int, int]:
+        """(slot, record offset) for `key`; offset 0 means absent."""
+        fp = fp or _fingerprint(key)
+        mask = self._capacity - 1
+        idx = self._idx
+        slot = fp & mask
+        while True:
+            slot_fp, off = SLOT.unpack_from(idx, IDX_HEADER.size + slot * SLOT.size)
+            if not off or (slot_fp == fp and self._key_at(off) == key):
+                return slot, off
+            slot = (slot + 1) & mask
+
+    def _insert_new(self, fp: int, off: int):
+        mask = self._capacity - 1
+        slot = fp & mask
+        while SLOT.unpack_from(self._idx, IDX_HEADER.size + slot * SLOT.size)[1]:
+            slot = (slot + 1) & mask
+        SLOT.pack_into(self._idx, IDX_HEADER.size + slot * SLOT.size, fp, off)
+        self._used += 1
+
+    def _index_put(self, key: bytes, off: int):
+        if self._used + 1 > self._capacity * MAX_LOAD:
+            self._resize(self._capacity * 2)
+        fp = _fingerprint(key)
+        slot, old = self._lookup(key, fp)
+        for snap in self._snapshots:
+            snap._preserve(key, old)
+        if not old:
+            self._used += 1
+        SLOT.pack_into(self._idx, IDX_HEADER.size + slot * SLOT.size, fp, off)
+
+    def _offsets(self, prefix: bytes) -> Dict[bytes, int]:
+        """key -> newest record offset for every indexed key under `prefix`."""
+        found = {}
+        idx = self._idx
+        for i in range(self._capacity):
+            off = SLOT.unpack_from(idx, IDX_HEADER.size + i * SLOT.size)[1]
+            if off:
+                key = self._key_at(off)
+                if key.startswith(prefix):
+                    found[key] = off
+        return found
+
+    def _iterate(self, offsets: Dict[bytes, int]) -> Iterator[Tuple[bytes, bytes]]:
+        for key in sorted(offsets):
+            value = self._value_at(offsets[key])
+            if value is not None:
+                yield key, value
+
+
+class LogSnapshot(BaseSnapshot):
+    """Point-in-time view of a LogDB.
+
+    Records are immutable, so a snapshot only has to remember, for each key
+    written after it was taken, the record offset it had at that moment.
+    """
+
+    def __init__(self, db: LogDB):
+        self.db = db
+        self._saved: Dict[bytes, int] = {}    # key -> offset at snapshot time (0 = absent)
+        db._snapshots.add(self)
+
+    def _preserve(self, key: bytes, off: int):
+        self._saved.setdefault(key, off)
+
+    def _offset(self, key: bytes) -> int:
+        if key in self._saved:
+            return self._saved[key]
+        return self.db._lookup(key)[1]
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self.db._value_at(self._offset(key))
+
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        offsets = self.db._offsets(prefix)
+        for key, off in self._saved.items():
+            if key.startswith(prefix):
+                offsets[key] = off
+        return self.db._iterate(offsets)
+
+    def close(self):
+        self.db._snapshots.discard(self)
+        self._saved = {}
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# db/memory.py
+#
+# dict-backed store for tests and ephemeral devnets.
+#
+# Snapshot file:  magic | count u64 | (key length u32, value length u32, key, value) * count
+#
+
+import os
+import struct
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from ethereum_node.db.base import BaseKV, BaseSnapshot
+
+SNAPSHOT_MAGIC = b"ENMEM001"
+HEADER = struct.Struct("<8sQ")
+RECORD = struct.Struct("<II")
+
+
+def _sorted_items(data: Dict[bytes, bytes], prefix: bytes) -> Iterator[Tuple[bytes, bytes]]:
+    for key in sorted(k for k in data if k.startswith(prefix)):
+        yield key, data[key]
+
+
+def dump_snapshot(path: str, data: Dict[bytes, bytes]):
+    """Write `data` to `path` atomically (temp file + rename)."""
+    parts = [HEADER.pack(SNAPSHOT_MAGIC, len(data))]
+    for key, value in data.items():
+        parts.append(RECORD.pack(len(key), len(value)))
+        parts.append(key)
+        parts.append(value)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(parts))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: str) -> Dict[bytes, bytes]:
+    with open(path, "rb") as f:
+        blob = f.read()
+    magic, count = HEADER.unpack_from(blob, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a MemoryDB snapshot")
+    data = {}
+    view = memoryview(blob)
+    off = HEADER.size
+    for _ in range(count):
+        klen, vlen = RECORD.unpack_from(blob, off)
+        off += RECORD.size
+        key = bytes(view[off : off + klen])
+        off += klen
+        data[key] = bytes(view[off : off + vlen])
+        off += vlen
+    return data
+
+
+class MemorySnapshot(BaseSnapshot):
+    """Frozen shallow copy of the store; values are immutable bytes."""
+
+    def __init__(self, data: Dict[bytes, bytes]):
+        self._data = data
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._data.get(key)
+
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        return _sorted_items(self._data, prefix)
+
+    def close(self):
+        self._data = {}
+
+
+class MemoryDB(BaseKV):
+    """Keys and values held in a dict.
+
+    With `snapshot_path`, the contents are loaded from that file at
+    startup and written back on close(). Adding `interval` (seconds)
+    also starts a daemon thread that saves any changes that often, so a
+    crash loses at most one interval of writes.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None, interval: Optional[float] = None):
+        self.snapshot_path = snapshot_path
+        self._data: Dict[bytes, bytes] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()      # one writer of the snapshot file
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if snapshot_path and os.path.exists(snapshot_path):
+            self._data = load_snapshot(snapshot_path)
+        if snapshot_path and interval:
+            self._thread = threading.Thread(
+                target=self._save_loop, args=(interval,), name="memorydb-snapshot", daemon=True
+            )
+            self._thread.start()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._data.get(key)
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+        data = self._data
+        return {key: data.get(key) for key in keys}
+
+    def put(self, key: bytes, value: bytes):
+        with self._lock:
+            self._data[key] = bytes(value)
+            self._dirty = True
+
+    def delete(self, key: bytes):
+        with self._lock:
+            self._data.pop(key, None)
+            self._dirty = True
+
+    def apply_batch(self, ops: Dict[bytes, Optional[bytes]]):
+        with self._lock:
+            data = self._data
+            for key, value in ops.items():
+                if value is None:
+                    data.pop(key, None)
+                else:
+                    data[key] = bytes(value)
+            self._dirty = True
+
+    def iterate(self, prefix: bytes = b"") -> Iterator[Tuple[bytes, bytes]]:
+        with self._lock:
+            data = dict(self._data)
+        return _sorted_items(data, prefix)
+
+    def snapshot(self) -> MemorySnapshot:
+        with self._lock:
+            return MemorySnapshot(dict(self._data))
+
+    def save(self):
+        """Write the snapshot file now if anything changed since the last save."""
+        if not self.snapshot_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = dict(self._data)
+                self._dirty = False
+            try:
+                dump_snapshot(self.snapshot_path, data)
+            except OSError:
+                self._dirty = True
+                raise
+
+    def _save_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.save()
+
+    def close(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+    def __len__(self):
+        return len(self._data)
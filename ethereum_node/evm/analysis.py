@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# evm/analysis.py
+
+from typing import Dict, Optional, Tuple
+
+from ethereum_node.evm.gas import GAS_COSTS
+from ethereum_node.utils.hash import keccak256
+from ethereum_node.utils.lru import LRUCache
+
+PUSH1 = 0x60
+PUSH32 = 0x7f
+JUMPDEST = 0x5b
+
+# Opcodes that never fall through to the next instruction of the same block
+# (STOP, JUMP, JUMPI, RETURN, REVERT, SELFDESTRUCT).
+BLOCK_TERMINATORS = frozenset({0x00, 0x56, 0x57, 0xf3, 0xfd, 0xff})
+
+ANALYSIS_CACHE_SIZE = 1024  # distinct contracts kept analysed
+
+
+class CodeAnalysis:
+    """One-time static analysis of a contract's bytecode.
+
+    `blocks` maps the pc of every basic block start to (static gas, number
+    of instructions). A block ends after a terminator, before a JUMPDEST
+    or at the end of the code, so the interpreter can charge a block's
+    static gas up front and run its instructions without per-op checks.
+
+    `jumpdests` is a bitmap with one bit per code byte, set for JUMPDEST
+    opcodes that are not part of PUSH immediates.
+    """
+
+    def __init__(self, code: bytes):
+        self.code = code
+        self.blocks: Dict[int, Tuple[int, int]] = {}
+        self.jumpdests = bytearray((len(code) + 7) // 8)
+        self._analyze()
+
+    def is_jumpdest(self, dest: int) -> bool:
+        if dest >= len(self.code):
+            return False
+        return bool(self.jumpdests[dest >> 3] & (1 << (dest & 7)))
+
+    def _analyze(self):
+        code = self.code
+        size = len(code)
+        pc = 0
+        start = 0
+        gas = 0
+        count = 0
+        while pc < size:
+            opcode = code[pc]
+            if opcode == JUMPDEST:
+                self.jumpdests[pc >> 3] |= 1 << (pc & 7)
+                if count:
+                    self.blocks[start] = (gas, count)
+                    start, gas, count = pc, 0, 0
+            gas += GAS_COSTS.get(opcode, 0)
+            count += 1
+            if PUSH1 <= opcode <= PUSH32:
+                pc += opcode - PUSH1 + 1
+            pc += 1
+            if opcode in BLOCK_TERMINATORS:
+                self.blocks[start] = (gas, count)
+                start, gas, count = pc, 0, 0
+        if count:
+            self.blocks[start] = (gas, count)
+
+
+_cache = LRUCache(ANALYSIS_CACHE_SIZE)
+
+
+def analyze_code(code: bytes, code_hash: Optional[bytes] = None) -> CodeAnalysis:
+    """Return the (cached) analysis for `code`, keyed by its keccak256 hash."""
+    if code_hash is None:
+        code_hash = keccak256(code)
+    analysis = _cache.get(code_hash)
+    if analysis is None:
+        analysis = CodeAnalysis(code)
+        _cache.put(code_hash, analysis)
+    return analysis
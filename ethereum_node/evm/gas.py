@@ -13,6 +13,7 @@ GJUMPDEST = 1           # Cost for JUMPDEST
 
 # --- Memory expansion ---
 GMEMORY = 3             # Per word memory expansion cost
+GQUADCOEFFDIV = 512     # Divisor of the quadratic memory term
 
 # --- SHA3 ---
 GSHA3 = 30              # Fixed cost for SHA3
@@ -69,7 +70,8 @@ GTRANSACTION = 21000
 
 # --- Utility ---
 def memory_expansion_cost(num_words: int) -> int:
-    return num_words * GMEMORY
+    """Total cost C_mem(a) of `num_words` active words (Yellow Paper eq. 326)."""
+    return num_words * GMEMORY + num_words * num_words // GQUADCOEFFDIV
 
 # --- Opcode gas costs (by opcode number) ---
 GAS_COSTS = {
@@ -1,18 +1,34 @@
 #!/usr/bin/env python3
 
+from ethereum_node.evm.gas import memory_expansion_cost
+
 WORD_SIZE = 32  # 32 bytes per word
 
 
 class Memory:
     def __init__(self):
-        self.data = bytearray()
+        self.data = bytearray()  # backing buffer, grown geometrically
+        self.words = 0           # active size in words
+
+    def expansion_cost(self, offset: int, size: int) -> int:
+        """Gas to make [offset:offset+size) active; zero-size access is free."""
+        if size == 0:
+            return 0
+        new_words = (offset + size + WORD_SIZE - 1) // WORD_SIZE
+        if new_words <= self.words:
+            return 0
+        return memory_expansion_cost(new_words) - memory_expansion_cost(self.words)
 
     def extend(self, end: int):
-        """Expand memory to cover [0:end), rounded up to nearest word."""
-        if end <= len(self.data):
+        """Expand active memory to cover [0:end), rounded up to nearest word."""
+        words = (end + WORD_SIZE - 1) // WORD_SIZE
+        if words <= self.words:
             return
-        new_size = ((end + WORD_SIZE - 1) // WORD_SIZE) * WORD_SIZE
-        self.data.extend(b"\x00" * (new_size - len(self.data)))
+        needed = words * WORD_SIZE
+        capacity = len(self.data)
+        if needed > capacity:
+            self.data.extend(bytes(max(needed, 2 * capacity) - capacity))
+        self.words = words
 
     def store(self, offset: int, value: bytes):
         """Write value at given offset."""
@@ -26,9 +42,24 @@ class Memory:
         """Read `size` bytes starting at `offset`."""
         if offset < 0 or size < 0:
             raise ValueError("Offset and size must be non-negative")
+        if size == 0:
+            return b""
         end = offset + size
         self.extend(end)
-        return bytes(self.data[offset:end])
+        with memoryview(self.data) as view:
+            return bytes(view[offset:end])
+
+    def view(self, offset: int, size: int) -> memoryview:
+        """Zero-copy read of `size` bytes starting at `offset`.
+
+        The backing buffer cannot grow while a view is alive, so release it
+        (e.g. `with mem.view(...) as v:`) before the next expansion.
+        """
+        if offset < 0 or size < 0:
+            raise ValueError("Offset and size must be non-negative")
+        if size:
+            self.extend(offset + size)
+        return memoryview(self.data)[offset : offset + size]
 
     def __len__(self):
-        return len(self.data)
+        return self.words * WORD_SIZE
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 
-from ethereum_node.evm.stack import EVMStack
+from ethereum_node.evm.stack import EVMStack, UINT256_CEILING, UINT256_MASK
 from ethereum_node.evm.memory import Memory
 from ethereum_node.evm.storage import JournaledStorage
 from ethereum_node.evm.gas import GAS_COSTS
+from ethereum_node.evm.analysis import analyze_code
 import operator
 from ethereum_node.utils.hash import keccak256
 
@@ -39,10 +40,21 @@ def make_swap(n):
     return swap
 
 
+def charge_memory(vm, offset: int, size: int):
+    """Charge quadratic expansion gas for touching [offset:offset+size)."""
+    cost = vm.memory.expansion_cost(offset, size)
+    if cost:
+        vm.gas_left -= cost
+        if vm.gas_left < 0:
+            raise Exception("Out of gas")
+        vm.memory.extend(offset + size)
+
+
 def op_return(vm):
     size = vm.stack.pop()
     offset = vm.stack.pop()
-    data = vm.memory.load(offset, size)
+    charge_memory(vm, offset, size)
+    data = vm.memory.load(offset, size)  # one copy: output outlives the frame
     raise Halt(return_data=data)
 
 
@@ -50,10 +62,13 @@ def make_binop(fn):
     def binop(vm):
         b = vm.stack.pop()
         a = vm.stack.pop()
-        vm.stack.push(fn(a, b) % 2**256)
+        vm.stack.push(fn(a, b) & UINT256_MASK)
     return binop
 
 
+SIGN_BIT = 2**255
+
+
 def evm_div(a: int, b: int) -> int:
     return 0 if b == 0 else a // b
 
@@ -62,12 +77,12 @@ def evm_sdiv(a: int, b: int) -> int:
     if b == 0:
         return 0
     # Convert to signed 256-bit integers
-    a_signed = (a if a < 2**255 else a - 2**256)
-    b_signed = (b if b < 2**255 else b - 2**256)
+    a_signed = (a if a < SIGN_BIT else a - UINT256_CEILING)
+    b_signed = (b if b < SIGN_BIT else b - UINT256_CEILING)
     result = abs(a_signed) // abs(b_signed)
     if (a_signed < 0) != (b_signed < 0):
         result = -result
-    return result % 2**256  # Wrap back to uint256
+    return result & UINT256_MASK  # Wrap back to uint256
 
 
 # Mapping of opcode byte to handler function
@@ -113,26 +128,30 @@ def execute_opcode(vm, opcode):
 # --- Memory operations ---
 def mload(vm):
     offset = vm.stack.pop()
-    data = vm.memory.load(offset, 32)
-    vm.stack.push(int.from_bytes(data, 'big'))
+    charge_memory(vm, offset, 32)
+    with vm.memory.view(offset, 32) as data:
+        vm.stack.push(int.from_bytes(data, 'big'))
 
 def mstore(vm):
     offset = vm.stack.pop()
     value = vm.stack.pop()
+    charge_memory(vm, offset, 32)
     data = value.to_bytes(32, 'big')
     vm.memory.store(offset, data)
 
 def mstore8(vm):
     offset = vm.stack.pop()
     value = vm.stack.pop() & 0xff
+    charge_memory(vm, offset, 1)
     vm.memory.store(offset, bytes([value]))
 
 # --- SHA3 ---
 def sha3(vm):
     offset = vm.stack.pop()
     size = vm.stack.pop()
-    data = vm.memory.load(offset, size)
-    hashed = keccak256(data)  # Simulate KECCAK256 with SHA3-256 placeholder
+    charge_memory(vm, offset, size)
+    with vm.memory.view(offset, size) as data:
+        hashed = keccak256(data)
     vm.stack.push(int.from_bytes(hashed, 'big'))
 
 # --- Storage operations ---
@@ -151,10 +170,11 @@ def make_log(n):
     def log_op(vm):
         offset = vm.stack.pop()
         size = vm.stack.pop()
-        data = vm.memory.load(offset, size)
+        charge_memory(vm, offset, size)
         topics = [vm.stack.pop() for _ in range(n)]
         # For now, we just print. Real EVM clients would emit a log event.
-        print(f"LOG{n}: topics={topics}, data={data.hex()}")
+        with vm.memory.view(offset, size) as data:
+            print(f"LOG{n}: topics={topics}, data={data.hex()}")
     return log_op
 
 # Register opcodes
@@ -170,13 +190,11 @@ for i in range(5):
 
 # Control Flow
 def is_valid_jumpdest(code: bytes, dest: int) -> bool:
-    if dest >= len(code):
-        return False
-    return code[dest] == 0x5b  # 0x5b = JUMPDEST
+    return analyze_code(code).is_jumpdest(dest)
 
 def op_jump(vm):
     dest = vm.stack.pop()
-    if not is_valid_jumpdest(vm.code, dest):
+    if not vm.analysis.is_jumpdest(dest):
         raise Exception(f"Invalid jump destination: {hex(dest)}")
     vm.pc = dest - 1  # -1 because pc will be incremented after this
 
@@ -184,7 +202,7 @@ def op_jumpi(vm):
     dest = vm.stack.pop()
     cond = vm.stack.pop()
     if cond != 0:
-        if not is_valid_jumpdest(vm.code, dest):
+        if not vm.analysis.is_jumpdest(dest):
             raise Exception(f"Invalid jump destination: {hex(dest)}")
         vm.pc = dest - 1
 
@@ -221,6 +239,7 @@ def op_selfdestruct(vm):
 def op_revert(vm):
     offset = vm.stack.pop()
     size = vm.stack.pop()
+    charge_memory(vm, offset, size)
     data = vm.memory.load(offset, size)
     raise Halt(return_data=data)  # Revert still returns data
 
@@ -240,3 +259,25 @@ OPCODES[0xf0] = op_create
 OPCODES[0xf5] = op_create2
 OPCODES[0xff] = op_selfdestruct
 OPCODES[0xfd] = op_revert
+
+
+# --- Dispatch table ---
+def make_invalid(opcode):
+    def invalid(vm):
+        raise NotImplementedError(f"Opcode {hex(opcode)} not supported")
+    return invalid
+
+
+def build_jump_table():
+    """Flatten OPCODES and GAS_COSTS into 256 (handler, static_gas) slots."""
+    table = []
+    for opcode in range(256):
+        handler = OPCODES.get(opcode)
+        if handler is None:
+            table.append((make_invalid(opcode), 0))
+        else:
+            table.append((handler, GAS_COSTS.get(opcode, 0)))
+    return table
+
+
+JUMP_TABLE = build_jump_table()
@@ -3,6 +3,8 @@
 # evm/stack.py
 
 STACK_LIMIT = 1024
+UINT256_CEILING = 2**256
+UINT256_MASK = UINT256_CEILING - 1
 
 class StackOverflow(Exception):
     pass
@@ -15,7 +17,7 @@ class EVMStack:
         self._data = []
 
     def push(self, value: int):
-        if not (0 <= value < 2**256):
+        if not (0 <= value < UINT256_CEILING):
             raise ValueError("Stack value must be a 256-bit integer")
         if len(self._data) >= STACK_LIMIT:
             raise StackOverflow("Stack overflow")
@@ -35,7 +37,7 @@ class EVMStack:
 
     def set(self, index: int, value: int):
         """Set value at depth index (0 = top item)"""
-        if not (0 <= value < 2**256):
+        if not (0 <= value < UINT256_CEILING):
             raise ValueError("Value must be 256-bit")
         if index >= len(self._data):
             raise StackUnderflow("Set index out of bounds")
@@ -43,3 +45,53 @@ class EVMStack:
 
     def __len__(self):
         return len(self._data)
+
+
+class FastStack:
+    """Interpreter stack that trusts its inputs.
+
+    Values must already be reduced to 256 bits (handlers mask with
+    UINT256_MASK); only depth is checked. Slots are preallocated and `_top`
+    counts the live items, so push/pop never resize the list.
+    """
+
+    __slots__ = ("_data", "_top")
+
+    def __init__(self):
+        self._data = [0] * STACK_LIMIT
+        self._top = 0
+
+    def push(self, value: int):
+        top = self._top
+        if top >= STACK_LIMIT:
+            raise StackOverflow("Stack overflow")
+        self._data[top] = value
+        self._top = top + 1
+
+    def pop(self, index: int = 0) -> int:
+        """Pop from top with optional depth index (0 = top)"""
+        top = self._top
+        if index >= top:
+            raise StackUnderflow("Pop index out of bounds")
+        data = self._data
+        pos = top - 1 - index
+        value = data[pos]
+        if index:
+            data[pos : top - 1] = data[pos + 1 : top]
+        self._top = top - 1
+        return value
+
+    def peek(self, index: int = 0) -> int:
+        """Peek from the top, 0-based (0 = top item, 1 = next)"""
+        if index >= self._top:
+            raise StackUnderflow("Peek index out of bounds")
+        return self._data[self._top - 1 - index]
+
+    def set(self, index: int, value: int):
+        """Set value at depth index (0 = top item)"""
+        if index >= self._top:
+            raise StackUnderflow("Set index out of bounds")
+        self._data[self._top - 1 - index] = value
+
+    def __len__(self):
+        return self._top
@@ -1,36 +1,54 @@
 #!/usr/bin/env python3
 
+from typing import Dict, List, Optional
+
+from ethereum_node.utils.layers import MISSING, DiffLayers
+
+
 class JournaledStorage:
     def __init__(self):
-        self._store = {}         # persistent state: key → value
-        self._original = {}      # original value before any change (used for journaling)
-        self._touched = set()    # keys that have been modified in the current transaction
+        self._store: Dict[int, int] = {}    # committed state: key → value
+        self._layers = DiffLayers()         # uncommitted writes, one layer per snapshot
+        self._ids: List[int] = []           # snapshot id of each pushed layer
+        self._next_id = 0
 
     def load(self, key: int) -> int:
-        return self._store.get(key, 0)
+        value = self._layers.get(key)
+        if value is MISSING:
+            return self._store.get(key, 0)
+        return value
 
     def store(self, key: int, value: int):
-        if key not in self._original:
-            self._original[key] = self._store.get(key, 0)
-        self._store[key] = value
-        self._touched.add(key)
-
-    def snapshot(self):
-        """Returns a snapshot of the current state."""
-        return self._store.copy(), self._original.copy(), self._touched.copy()
-
-    def revert(self):
-        """Reverts all changes made since the beginning (for now, full revert)."""
-        for key in self._touched:
-            original = self._original[key]
-            if original == 0:
-                self._store.pop(key, None)
-            else:
-                self._store[key] = original
-        self._original.clear()
-        self._touched.clear()
+        self._layers.set(key, value)
+
+    def snapshot(self) -> int:
+        """Open a layer for a call frame; O(1), nothing is copied."""
+        self._next_id += 1
+        self._layers.push()
+        self._ids.append(self._next_id)
+        return self._next_id
+
+    def revert(self, snapshot_id: Optional[int] = None):
+        """Drop changes made since `snapshot_id`, or since the last commit."""
+        if snapshot_id is None:
+            self._layers.clear()
+            self._ids.clear()
+            return
+        while self._ids and self._ids[-1] >= snapshot_id:
+            self._ids.pop()
+            self._layers.pop()
+
+    def merge(self, snapshot_id: int):
+        """Keep the changes made since `snapshot_id` and close the snapshot."""
+        while self._ids and self._ids[-1] >= snapshot_id:
+            self._ids.pop()
+            self._layers.merge()
 
     def commit(self):
-        """Commits all changes (clears the journal)."""
-        self._original.clear()
-        self._touched.clear()
+        """Apply all pending changes to the committed state."""
+        for key, value in self._layers.flatten().items():
+            if value == 0:
+                self._store.pop(key, None)
+            else:
+                self._store[key] = value
+        self._ids.clear()
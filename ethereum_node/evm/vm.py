@@ -1,24 +1,29 @@
 #!/usr/bin/env python3
 
-from ethereum_node.evm.stack import EVMStack
+from ethereum_node.evm.stack import EVMStack, FastStack
 from ethereum_node.evm.memory import Memory
 from ethereum_node.evm.storage import JournaledStorage
-from ethereum_node.evm.opcodes import OPCODES
+from ethereum_node.evm.opcodes import JUMP_TABLE
 from ethereum_node.evm.opcodes import Halt
-from ethereum_node.evm.gas import GAS_COSTS
+from ethereum_node.evm.analysis import analyze_code
+
+HANDLERS = [handler for handler, _ in JUMP_TABLE]
 
 class EVM:
-    def __init__(self, code, gas=10**6, tracer=None):
+    def __init__(self, code, gas=10**6, tracer=None, fast_stack=True):
         self.code = code                  # bytecode to execute
-        self.pc = 0                       # program counter
-        self.stack = EVMStack()
+        self.pc = 0                       # program counter (current opcode)
+        self.stack = FastStack() if fast_stack else EVMStack()
         self.memory = Memory()
         self.storage = JournaledStorage()
         self.gas_left = gas
         self.tracer = tracer              # optional hook: tracer.step(vm)
+        self.analysis = analyze_code(code)
 
     def read_bytes(self, n):
-        data = self.code[self.pc : self.pc + n]
+        """Read n immediate bytes following the current opcode."""
+        start = self.pc + 1
+        data = self.code[start : start + n]
         self.pc += n
         return data
 
@@ -27,24 +32,50 @@ class EVM:
             raise Halt()
 
         opcode = self.code[self.pc]
-        self.pc += 1
 
         if self.tracer:
             self.tracer.step(self, opcode)
 
-        self.gas_left -= GAS_COSTS.get(opcode, 0)
+        handler, gas = JUMP_TABLE[opcode]
+        self.gas_left -= gas
         if self.gas_left < 0:
             raise Exception("Out of gas")
 
-        if opcode not in OPCODES:
-            raise NotImplementedError(f"Opcode {hex(opcode)} not supported")
-
-        handler = OPCODES[opcode]
         handler(self)
+        self.pc += 1
 
     def run(self):
         try:
-            while True:
-                self.step()
+            if self.tracer is None:
+                self._run_fast()
+            else:
+                while True:
+                    self.step()
         except Halt as h:
             return h.return_data
+
+    def _run_fast(self):
+        """Untraced loop: charge static gas once per basic block.
+
+        A block that cannot be paid for in full fails up front, before any
+        of its instructions run; dynamic costs are still charged by the ops.
+        """
+        code = self.code
+        size = len(code)
+        blocks = self.analysis.blocks
+        handlers = HANDLERS
+        while True:
+            pc = self.pc
+            if pc >= size:
+                raise Halt()
+            block = blocks.get(pc)
+            if block is None:             # pc moved mid-block from outside the loop
+                self.step()
+                continue
+            gas, count = block
+            self.gas_left -= gas
+            if self.gas_left < 0:
+                raise Exception("Out of gas")
+            for _ in range(count):
+                handlers[code[self.pc]](self)
+                self.pc += 1
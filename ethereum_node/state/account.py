@@ -1,20 +1,39 @@
 #!/usr/bin/env python3
 
-from dataclasses import dataclass
-from ethereum_node.utils.rlp import encode
+from dataclasses import dataclass, field
+from typing import Optional
+from ethereum_node.utils.rlp import decode, encode
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Account:
+    """Immutable; use dataclasses.replace() for a changed copy, which starts
+    without a cached encoding."""
+
     nonce: int              # Number of transactions sent
     balance: int            # Wei balance
     storage_root: bytes     # Root of the storage trie (32 bytes)
     code_hash: bytes        # Keccak256 hash of the contract bytecode
+    _rlp: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_rlp(cls, encoded: bytes) -> "Account":
+        nonce, balance, storage_root, code_hash = decode(encoded)
+        account = cls(
+            int.from_bytes(nonce, "big"),
+            int.from_bytes(balance, "big"),
+            storage_root,
+            code_hash,
+        )
+        object.__setattr__(account, "_rlp", bytes(encoded))
+        return account
 
     def rlp(self) -> bytes:
-        return encode([
-            self.nonce,
-            self.balance,
-            self.storage_root,
-            self.code_hash
-        ])
+        if self._rlp is None:
+            object.__setattr__(self, "_rlp", encode([
+                self.nonce,
+                self.balance,
+                self.storage_root,
+                self.code_hash
+            ]))
+        return self._rlp
@@ -1,55 +1,130 @@
 #!/usr/bin/env python3
 
-from typing import Any, Dict, List, Tuple, Optional
-from ethereum_node.db.kv import KeyValueDB
+import threading
+from typing import Dict, Iterable, List, Optional
+from ethereum_node.db.base import BaseKV, WriteBatch
+from ethereum_node.utils.layers import MISSING, DiffLayers
 
 class JournalDB:
-    def __init__(self, db: KeyValueDB):
+    """Write overlay over a BaseKV with nested snapshots.
+
+    Pending writes (None = delete) live in DiffLayers, one layer per open
+    snapshot: snapshot() is O(1), revert() drops layers, merge() folds
+    them down, and commit() writes each dirty key once in one batch.
+    """
+
+    def __init__(self, db: BaseKV):
         self.db = db
-        self._journal: List[Tuple[int, bytes, Optional[bytes]]] = []
-        self._snapshots: List[int] = []
+        self._layers = DiffLayers()
+        self._ids: List[int] = []          # snapshot id of layers[1:], oldest first
         self._current_snapshot_id = 0
-        self._cache: Dict[bytes, Optional[bytes]] = {}
+        # Detached diffs, oldest first. The list is replaced, never mutated,
+        # so readers can iterate it while a committer thread releases one.
+        self._frozen: List[Dict[bytes, Optional[bytes]]] = []
+        self._frozen_lock = threading.Lock()
 
     def get(self, key: bytes) -> Optional[bytes]:
-        if key in self._cache:
-            return self._cache[key]
-        return self.db.get(key)
+        value = self._layers.get(key)
+        if value is MISSING:
+            for frozen in reversed(self._frozen):
+                if key in frozen:
+                    return frozen[key]
+            return self.db.get(key)
+        return value
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+        found: Dict[bytes, Optional[bytes]] = {}
+        missing = []
+        for key in keys:
+            value = self._layers.get(key)
+            if value is MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing and self._frozen:
+            unresolved = []
+            for key in missing:
+                for frozen in reversed(self._frozen):
+                    if key in frozen:
+                        found[key] = frozen[key]
+                        break
+                else:
+                    unresolved.append(key)
+            missing = unresolved
+        if missing:
+            found.update(self.db.get_many(missing))
+        return found
 
     def put(self, key: bytes, value: bytes) -> None:
-        old_value = self.get(key)
-        self._journal.append((self._current_snapshot_id, key, old_value))
-        self._cache[key] = value
+        self._layers.set(key, value)
 
     def delete(self, key: bytes) -> None:
-        old_value = self.get(key)
-        self._journal.append((self._current_snapshot_id, key, old_value))
-        self._cache[key] = None
+        self._layers.set(key, None)
 
     def set(self, key: bytes, value: bytes):
         self.put(key, value)
 
     def snapshot(self) -> int:
         self._current_snapshot_id += 1
-        self._snapshots.append(self._current_snapshot_id)
+        self._layers.push()
+        self._ids.append(self._current_snapshot_id)
         return self._current_snapshot_id
 
     def revert(self, snapshot_id: int):
-        while self._journal and self._journal[-1][0] >= snapshot_id:
-            _, key, old_value = self._journal.pop()
-            if old_value is None:
-                self._cache.pop(key, None)
-            else:
-                self._cache[key] = old_value
-        self._snapshots = [id for id in self._snapshots if id < snapshot_id]
-
-    def commit(self, snapshot_id: int):
-        for snap, key, _ in self._journal:
-            if snap <= snapshot_id and key in self._cache:
-                val = self._cache[key]
-                if val is None:
-                    self.db.delete(key)
+        """Drop every write made since `snapshot_id` was taken."""
+        while self._ids and self._ids[-1] >= snapshot_id:
+            self._ids.pop()
+            self._layers.pop()
+
+    def merge(self, snapshot_id: int):
+        """Keep the writes made since `snapshot_id` but close the snapshot."""
+        while self._ids and self._ids[-1] >= snapshot_id:
+            self._ids.pop()
+            self._layers.merge()
+
+    def write_batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    def apply_batch(self, ops: Dict[bytes, Optional[bytes]]):
+        for key, value in ops.items():
+            self._layers.set(key, value)
+
+    def commit(self, snapshot_id: Optional[int] = None):
+        """Write pending changes to the backing DB in one batch.
+
+        With no argument everything is flushed and all snapshots close.
+        Otherwise only the writes up to the end of `snapshot_id`'s layer
+        are written; later snapshots stay open and revertible.
+        """
+        if snapshot_id is None:
+            committed = len(self._ids)
+        else:
+            committed = sum(1 for sid in self._ids if sid <= snapshot_id)
+        dirty = self._layers.flatten(committed)
+        del self._ids[:committed]
+
+        with self.db.write_batch() as batch:
+            for key, value in dirty.items():
+                if value is None:
+                    batch.delete(key)
                 else:
-                    self.db.put(key, val)
-        self._journal = [entry for entry in self._journal if entry[0] > snapshot_id]
-        self._snapshots = [id for id in self._snapshots if id > snapshot_id]
+                    batch.put(key, value)
+
+    def detach(self) -> Dict[bytes, Optional[bytes]]:
+        """Close all snapshots and hand over every pending write as one diff.
+
+        The diff stays readable as a frozen layer, so work can continue on
+        top of it while another thread writes it with db.apply_batch; call
+        release() once it is stored. Detached diffs must be applied in the
+        order they were detached, before any later commit().
+        """
+        dirty = self._layers.flatten()
+        self._ids.clear()
+        with self._frozen_lock:
+            self._frozen = self._frozen + [dirty]
+        return dirty
+
+    def release(self, dirty: Dict[bytes, Optional[bytes]]):
+        """Forget a detached diff that is now in the backing DB."""
+        with self._frozen_lock:
+            self._frozen = [frozen for frozen in self._frozen if frozen is not dirty]
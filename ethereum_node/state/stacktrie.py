@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# ethereum_node/state/stacktrie.py
+#
+# Streaming trie construction from keys in sorted order.
+#
+
+from typing import Iterable, List, Optional, Tuple
+
+from ethereum_node.db.base import BaseKV
+from ethereum_node.state.trie import EMPTY_ROOT, Node, bytes_to_nibbles, encode_path
+from ethereum_node.utils.hash import keccak256
+from ethereum_node.utils.rlp import encode
+
+Frame = Tuple[int, List[Node]]                  # (depth, 17-slot branch)
+
+BATCH_SIZE = 10_000                             # finished nodes per DB transaction
+
+
+def _common_prefix(a: List[int], b: List[int]) -> int:
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class StackTrie:
+    """Build a trie from keys inserted in strictly increasing order.
+
+    Only the branches along the most recent key are kept open. When the
+    next key diverges from it at depth d, every subtree below d is final:
+    its nodes are encoded, hashed and stored exactly once and replaced by
+    their references. The resulting root equals the one `Trie` computes
+    for the same items.
+    """
+
+    def __init__(self, db: BaseKV):
+        self.db = db
+        self._batch = db.write_batch()
+        self._frames: List[Frame] = []          # open branches, shallowest first
+        self._key: Optional[List[int]] = None   # pending leaf (nibbles)
+        self._value = b""
+        self._last: Optional[bytes] = None
+
+    def update(self, key: bytes, value: bytes) -> None:
+        if self._last is not None and key <= self._last:
+            raise ValueError("StackTrie keys must be strictly increasing")
+        nibbles = bytes_to_nibbles(key)
+        if self._key is not None:
+            self._close(_common_prefix(self._key, nibbles))
+        self._key, self._value, self._last = nibbles, value, key
+
+    def root_hash(self) -> bytes:
+        """Finalise the remaining path, store the root and reset the builder."""
+        key = self._key
+        if key is None:
+            return EMPTY_ROOT
+        frames = self._frames
+        if not frames:
+            root: Node = [encode_path(key, True), self._value]
+        else:
+            self._attach_leaf(*frames[-1])
+            while len(frames) > 1:
+                self._attach_branch(frames.pop(), frames[-1])
+            depth, branch = frames.pop()
+            root = self._wrap(branch, key[:depth])
+        encoded = encode(root)
+        root_hash = keccak256(encoded)
+        self._batch.put(root_hash, encoded)
+        self._batch.commit()
+        self._key, self._value, self._last = None, b"", None
+        return root_hash
+
+    # ── internal ──────────────────────────────────────────────────────
+
+    def _close(self, depth: int) -> None:
+        """Place the pending leaf and finalise every branch below `depth`."""
+        frames = self._frames
+        if not frames or frames[-1][0] < depth:
+            frames.append((depth, [b"" for _ in range(17)]))
+        self._attach_leaf(*frames[-1])
+        while frames[-1][0] > depth:
+            frame = frames.pop()
+            if not frames or frames[-1][0] < depth:
+                frames.append((depth, [b"" for _ in range(17)]))
+            self._attach_branch(frame, frames[-1])
+
+    def _attach_leaf(self, depth: int, branch: List[Node]) -> None:
+        key = self._key
+        assert key is not None
+        if len(key) == depth:
+            branch[16] = self._value
+        else:
+            branch[key[depth]] = self._ref([encode_path(key[depth + 1:], True), self._value])
+
+    def _attach_branch(self, child: Frame, parent: Frame) -> None:
+        key = self._key
+        assert key is not None
+        depth, branch = child
+        parent_depth, slots = parent
+        slots[key[parent_depth]] = self._ref(self._wrap(branch, key[parent_depth + 1:depth]))
+
+    def _wrap(self, branch: List[Node], path: List[int]) -> Node:
+        """Put an extension in front of `branch` when `path` is non-empty."""
+        if not path:
+            return branch
+        return [encode_path(path, False), self._ref(branch)]
+
+    def _ref(self, node: Node) -> Node:
+        encoded = encode(node)
+        if len(encoded) < 32:
+            return node
+        node_hash = keccak256(encoded)
+        self._batch.put(node_hash, encoded)
+        if len(self._batch) >= BATCH_SIZE:
+            self._batch.commit()
+        return node_hash
+
+
+def build_trie(db: BaseKV, items: Iterable[Tuple[bytes, bytes]]) -> bytes:
+    """Store the trie for sorted (key, value) pairs and return its root hash.
+
+    `items` may be a generator: memory stays bounded by one key path plus
+    one pending write batch.
+    """
+    builder = StackTrie(db)
+    for key, value in items:
+        builder.update(key, value)
+    return builder.root_hash()
@@ -1,72 +1,174 @@
 #!/usr/bin/env python3
 # ethereum_node/state/state.py
 
-from typing import Optional
-from ethereum_node.db.kv import KeyValueDB
+from dataclasses import replace
+from typing import Dict, List, Optional, Set, Tuple
+
+from ethereum_node.db.base import BaseKV
 from ethereum_node.state.journal import JournalDB
-from ethereum_node.state.trie import Trie
+from ethereum_node.state.trie import EMPTY_ROOT, Node, Trie
 from ethereum_node.state.account import Account
-from ethereum_node.utils.rlp import encode, decode
+from ethereum_node.utils.rlp import encode
 from ethereum_node.utils.hash import keccak256
+from ethereum_node.utils.layers import MISSING, DiffLayers
+
+# Flat snapshot: the latest leaf values keyed directly, next to the trie
+# nodes (whose keys are 32-byte hashes). Reads go here in one lookup; the
+# tries are only updated for root computation and proofs.
+ACCOUNT_PREFIX = b"a"
+STORAGE_PREFIX = b"s"
+
+
+def account_key(address: bytes) -> bytes:
+    return ACCOUNT_PREFIX + address
+
+
+def storage_key(address: bytes, slot: bytes) -> bytes:
+    return STORAGE_PREFIX + address + slot
+
+
+EMPTY_CODE_HASH = keccak256(b"")
+CLEAN = -1                              # flush epoch of a cached account read from disk
 
 
 class State:
-    def __init__(self, db: KeyValueDB):
+    """World state with a per-block cache of decoded accounts.
+
+    `_accounts` maps address -> (Account, epoch). An entry whose epoch is
+    the current `_epoch` is dirty, and `_dirty` lists the addresses written
+    in each epoch; flush() writes just those accounts to the account trie
+    and flat snapshot once, in key order, then starts a new epoch. Storage
+    tries stay open per account between slot writes and are only hashed
+    by flush(). Snapshots push a layer and remember the trie root and
+    epoch, so revert is exact even across a flush.
+    """
+
+    def __init__(self, db: BaseKV):
         self.journal = JournalDB(db)
-        self.trie = Trie(self.journal)
+        self.trie = Trie(self.journal, deferred=True)
+        self._accounts = DiffLayers()       # address -> (Account, epoch)
+        self._storage_roots = DiffLayers()  # address -> unhashed storage trie root
+        self._storage_tries: Dict[bytes, Trie] = {}
+        self._epoch = 0
+        self._dirty: Dict[int, Set[bytes]] = {}  # epoch -> addresses written in it
+        self._snapshots: List[Tuple[int, Optional[Node], int]] = []  # (id, trie root, epoch)
 
     def get_account(self, address: bytes) -> Optional[Account]:
-        encoded = self.trie.get(address)
-        if not encoded:
-            return None
-        fields = decode(encoded)
-        return Account(
-            nonce=int(fields[0]),
-            balance=int(fields[1]),
-            storage_root=fields[2],
-            code_hash=fields[3]
-        )
+        """Accounts are immutable; use set_account to store a changed one."""
+        return self._load(address)
+
+    def _load(self, address: bytes) -> Optional[Account]:
+        entry = self._accounts.get(address)
+        if entry is not MISSING:
+            return entry[0]
+        encoded = self.journal.get(account_key(address))
+        account = Account.from_rlp(encoded) if encoded else None
+        self._accounts.set(address, (account, CLEAN))
+        return account
 
     def set_account(self, address: bytes, account: Account) -> None:
-        self.trie.update(address, account.rlp())
+        self._mark_dirty(address, account)
+
+    def _mark_dirty(self, address: bytes, account: Account) -> None:
+        self._accounts.set(address, (account, self._epoch))
+        self._dirty.setdefault(self._epoch, set()).add(address)
 
     def transfer(self, sender: bytes, recipient: bytes, amount: int) -> None:
-        sender_acct = self.get_account(sender) or Account(0, 0, keccak256(encode(b"")), keccak256(b""))
-        recipient_acct = self.get_account(recipient) or Account(0, 0, keccak256(encode(b"")), keccak256(b""))
+        sender_acct = self._load(sender) or Account(0, 0, keccak256(encode(b"")), EMPTY_CODE_HASH)
+        recipient_acct = self._load(recipient) or Account(0, 0, keccak256(encode(b"")), EMPTY_CODE_HASH)
 
         assert sender_acct.balance >= amount, "Insufficient funds"
 
-        sender_acct.balance -= amount
-        recipient_acct.balance += amount
-
-        self.set_account(sender, sender_acct)
-        self.set_account(recipient, recipient_acct)
+        self._mark_dirty(sender, replace(sender_acct, balance=sender_acct.balance - amount))
+        recipient_acct = self._load(recipient) or recipient_acct
+        self._mark_dirty(recipient, replace(recipient_acct, balance=recipient_acct.balance + amount))
 
     def get_storage_trie(self, storage_root: bytes) -> Trie:
-        return Trie(self.journal, root=storage_root)
+        return Trie(self.journal, root=storage_root, deferred=True)
+
+    def _storage_trie(self, address: bytes, account: Account) -> Trie:
+        trie = self._storage_tries.get(address)
+        if trie is None:
+            trie = self._storage_tries[address] = self.get_storage_trie(account.storage_root)
+        root = self._storage_roots.get(address)
+        trie.root = account.storage_root if root is MISSING else root
+        if trie.root == EMPTY_ROOT:
+            trie.root = None
+        return trie
 
     def get_storage(self, address: bytes, slot: bytes) -> bytes:
-        acct = self.get_account(address)
-        if not acct:
-            return b""
-        storage = self.get_storage_trie(acct.storage_root)
-        return storage.get(slot) or b""
+        return self.journal.get(storage_key(address, slot)) or b""
 
     def set_storage(self, address: bytes, slot: bytes, value: bytes) -> None:
-        acct = self.get_account(address)
+        acct = self._load(address)
         if not acct:
             raise Exception("Account does not exist")
 
-        storage = self.get_storage_trie(acct.storage_root)
+        storage = self._storage_trie(address, acct)
         storage.update(slot, value)
-        acct.storage_root = storage.root_hash()
-        self.set_account(address, acct)
+        self._storage_roots.set(address, storage.root)
+        self.journal.put(storage_key(address, slot), value)
+        self._mark_dirty(address, acct)
+
+    def flush(self) -> None:
+        """Write every dirty account to the trie once, in key order."""
+        epoch = self._epoch
+        for address in sorted(self._dirty.get(epoch, ())):
+            entry = self._accounts.get(address)
+            if entry is MISSING or entry[1] != epoch or entry[0] is None:
+                continue                            # write reverted since
+            account = entry[0]
+            root = self._storage_roots.get(address)
+            if root is not MISSING:
+                storage_root = self._storage_trie(address, account).commit()
+                self._storage_roots.set(address, storage_root)
+                account = replace(account, storage_root=storage_root)
+                self._accounts.set(address, (account, CLEAN))
+            encoded = account.rlp()
+            self.trie.update(address, encoded)
+            self.journal.put(account_key(address), encoded)
+        self._epoch += 1
+
+    def state_root(self) -> bytes:
+        self.flush()
+        return self.trie.root_hash()
 
     def snapshot(self) -> int:
-        return self.journal.snapshot()
+        snap = self.journal.snapshot()
+        self._accounts.push()
+        self._storage_roots.push()
+        self._snapshots.append((snap, self.trie.root, self._epoch))  # nodes are never mutated
+        return snap
 
     def revert(self, snap: int) -> None:
         self.journal.revert(snap)
+        while self._snapshots and self._snapshots[-1][0] >= snap:
+            _, self.trie.root, self._epoch = self._snapshots.pop()
+            self._accounts.pop()
+            self._storage_roots.pop()
+        for epoch in [epoch for epoch in self._dirty if epoch > self._epoch]:
+            del self._dirty[epoch]
 
     def commit(self) -> None:
+        self.state_root()
         self.journal.commit()
+        self._reset()
+
+    def detach(self) -> Dict[bytes, Optional[bytes]]:
+        """Like commit(), but return the writes for the caller to store.
+
+        Until JournalDB.release() is called with it, the returned diff is
+        served from memory, so the next block can execute on top of it
+        while it is written in the background.
+        """
+        self.state_root()
+        dirty = self.journal.detach()
+        self._reset()
+        return dirty
+
+    def _reset(self) -> None:
+        self._accounts.clear()
+        self._dirty.clear()
+        self._storage_roots.clear()
+        self._storage_tries.clear()
+        self._snapshots.clear()
@@ -9,13 +9,15 @@
 #   • conventional commit suggestion:  fix(trie): keep extension path tail when splitting & treat empty bytes as None
 #
 
-from typing import Union, List, Optional, Tuple
+import threading
+from typing import Dict, Iterable, Iterator, Union, List, Optional, Tuple
 
-from ethereum_node.utils.rlp import encode, decode
+from ethereum_node.utils.rlp import LazyList, decode_lazy, encode
 from ethereum_node.utils.hash import keccak256
-from ethereum_node.db.kv import KeyValueDB
+from ethereum_node.utils.lru import LRUCache
+from ethereum_node.db.base import BaseKV
 
-Node = Union[bytes, List["Node"]]            # raw 32‑byte hash or in‑memory node
+Node = Union[bytes, List["Node"], LazyList]  # raw 32‑byte hash or in‑memory node
 
 
 # ── helpers ──────────────────────────────────────────────────────────────
@@ -57,46 +59,225 @@ def decode_path(path: bytes) -> Tuple[List[int], bool]:
     return nibbles, is_leaf
 
 
+def _is_ref(node: Optional[Node]) -> bool:
+    """True for a 32-byte hash reference to a stored node."""
+    return isinstance(node, bytes) and len(node) == 32
+
+
+# ── node cache ───────────────────────────────────────────────────────────
+
+NODE_CACHE_BYTES = 32 * 1024 * 1024
+NODE_OVERHEAD    = 128                       # rough per-entry object cost
+
+
+class NodeCache:
+    """Decoded nodes keyed by node hash, shared by every Trie.
+
+    Nodes are content-addressed, so an entry is valid for any trie and any
+    database. Entries are LazyList views indexed in full before they are
+    stored, so a cached node is never written again and threads can share
+    it; callers that modify a node work on a materialised copy. Eviction is
+    LRU within a byte budget, so the upper levels that every lookup walks
+    through stay resident.
+    """
+
+    def __init__(self, max_bytes: int = NODE_CACHE_BYTES):
+        self._lru  = LRUCache(max_bytes)
+        self._lock = threading.Lock()
+
+    def get(self, node_hash: bytes) -> Optional[LazyList]:
+        with self._lock:
+            return self._lru.get(node_hash)
+
+    def put(self, node_hash: bytes, encoded: bytes) -> LazyList:
+        node = decode_lazy(encoded)
+        if isinstance(node, LazyList):
+            node.index_items()
+        with self._lock:
+            self._lru.put(node_hash, node, len(encoded) + NODE_OVERHEAD)
+        return node  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    @property
+    def hits(self) -> int:
+        return self._lru.hits
+
+    @property
+    def misses(self) -> int:
+        return self._lru.misses
+
+    @property
+    def size(self) -> int:
+        return self._lru.size
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+
+SHARED_NODE_CACHE = NodeCache()
+
+
 # ── trie ─────────────────────────────────────────────────────────────────
 
+EMPTY_ROOT = keccak256(encode(b""))
+
+
 class Trie:
-    def __init__(self, db: KeyValueDB):
-        self.db   = db
-        self.root: Optional[Node] = None
+    """Merkle-Patricia trie over a key/value node store.
+
+    By default every update hashes and stores the nodes on its path. With
+    `deferred=True` updates build in-memory (dirty) nodes instead, and
+    hashing and persistence happen once, in commit() / root_hash(). Nodes
+    are never modified in place, so a saved `root` reference is a cheap
+    snapshot of the whole trie in either mode.
+    """
+
+    def __init__(
+        self,
+        db: BaseKV,
+        root: Optional[bytes] = None,
+        cache: Optional[NodeCache] = SHARED_NODE_CACHE,
+        deferred: bool = False,
+    ):
+        self.db       = db
+        self.cache    = cache                       # None disables caching
+        self.deferred = deferred
+        self.root: Optional[Node] = None if root in (None, EMPTY_ROOT) else root
 
     # ── public API ────────────────────────────────────────────────────
 
     def get(self, key: bytes) -> Optional[bytes]:
         return self._get(self.root, bytes_to_nibbles(key))
 
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Optional[bytes]]:
+        """Look up many keys, descending one level for all of them at a time.
+
+        Each round resolves every hash reference the pending lookups have
+        reached with a single multi-get, instead of one read per node.
+        """
+        results: Dict[bytes, Optional[bytes]] = {}
+        pending = [(key, self.root, bytes_to_nibbles(key)) for key in keys]
+        while pending:
+            resolved = self._resolve_many({ref for _, ref, _ in pending if _is_ref(ref)})
+            waiting = []
+            for key, node, path in pending:
+                if _is_ref(node):
+                    node = resolved[node]  # type: ignore[index]
+                value, ref, rest = self._descend(node, path)
+                if ref is None:
+                    results[key] = value
+                else:
+                    waiting.append((key, ref, rest))
+            pending = waiting
+        return results
+
+    def items(self) -> Iterator[Tuple[bytes, bytes]]:
+        """Yield every (key, value) in key order.
+
+        All hashed children of a branch are fetched in one multi-get when the
+        walk reaches it, so a full scan costs one round trip per branch.
+        """
+        root = self.root
+        if _is_ref(root):
+            root = self._resolve_lazy(root)  # type: ignore[arg-type]
+        return self._iter_node(root, [])
+
     def update(self, key: bytes, value: bytes) -> None:
         self.root = self._update(self.root, bytes_to_nibbles(key), value)
 
     def root_hash(self) -> bytes:
-        return keccak256(encode(self.root)) if self.root else keccak256(encode(b""))
+        return self.commit()
+
+    def commit(self) -> bytes:
+        """Hash and persist any dirty nodes; return the root hash.
+
+        The root node is always stored under its hash, even when it would
+        be inlined as a child, so the trie can be reopened from it.
+        """
+        if not self.root:
+            return EMPTY_ROOT
+        if isinstance(self.root, bytes) and len(self.root) == 32:
+            return self.root
+        writes: List[Tuple[bytes, bytes]] = []
+        root = self._commit_node(self.root, writes)
+        if not isinstance(root, bytes):
+            encoded = encode(root)
+            root = keccak256(encoded)
+            writes.append((root, encoded))
+        with self.db.write_batch() as batch:
+            for node_hash, encoded in writes:
+                batch.put(node_hash, encoded)
+        if self.cache is not None:
+            for node_hash, encoded in writes:
+                self.cache.put(node_hash, encoded)
+        self.root = root
+        return root
 
     # ── internal: lookup ─────────────────────────────────────────────
 
     def _get(self, node: Optional[Node], key: List[int]) -> Optional[bytes]:
-        if node is None or node == b'':
-            return None
-        if isinstance(node, bytes) and len(node) == 32:
-            node = self._resolve(node)
+        value, ref, rest = self._descend(node, key)
+        while ref is not None:
+            value, ref, rest = self._descend(self._resolve_lazy(ref), rest)  # lookups touch one child
+        return value
+
+    def _descend(
+        self, node: Optional[Node], key: List[int]
+    ) -> Tuple[Optional[bytes], Optional[bytes], List[int]]:
+        """Follow `key` through in-memory nodes.
+
+        Returns (value, None, []) once the lookup is decided, or
+        (None, ref, rest) when it reaches a hash reference still to resolve.
+        """
+        while True:
+            if node is None or node == b'':
+                return None, None, []
+            if _is_ref(node):
+                return None, node, key  # type: ignore[return-value]
+
+            if len(node) == 2:                      # leaf | extension
+                path, is_leaf = decode_path(node[0])
+                if key[:len(path)] != path:
+                    return None, None, []
+                if is_leaf:
+                    return (node[1] if key == path else None), None, []
+                node, key = node[1], key[len(path):]
+
+            elif len(node) == 17:                   # branch
+                if not key:
+                    value = node[16]
+                    return (value if (isinstance(value, bytes) and value != b'') else None), None, []
+                node, key = node[key[0]], key[1:]
 
-        if len(node) == 2:                          # leaf | extension
+            else:
+                raise Exception("Invalid node structure")
+
+    def _iter_node(self, node: Node, prefix: List[int]) -> Iterator[Tuple[bytes, bytes]]:
+        if node is None or node == b'':
+            return
+        if len(node) == 2:
             path, is_leaf = decode_path(node[0])
-            if key[:len(path)] != path:
-                return None
             if is_leaf:
-                return node[1] if key == path else None
-            return self._get(node[1], key[len(path):])
-
-        if len(node) == 17:                         # branch
-            if not key:
-                return node[16] if (isinstance(node[16], bytes) and node[16] != b'') else None
-            return self._get(node[key[0]], key[1:])
-
-        raise Exception("Invalid node structure")
+                yield nibbles_to_bytes(prefix + path), node[1]
+                return
+            child = node[1]
+            if _is_ref(child):
+                child = self._resolve_lazy(child)  # type: ignore[arg-type]
+            yield from self._iter_node(child, prefix + path)
+            return
+
+        value = node[16]
+        if isinstance(value, bytes) and value != b'':
+            yield nibbles_to_bytes(prefix), value
+        children = [node[i] for i in range(16)]
+        resolved = self._resolve_many({c for c in children if _is_ref(c)})
+        for nibble, child in enumerate(children):
+            if _is_ref(child):
+                child = resolved[child]  # type: ignore[index]
+            yield from self._iter_node(child, prefix + [nibble])
 
     # ── internal: insert / update ────────────────────────────────────
 
@@ -170,6 +351,7 @@ class Trie:
 
         # ── BRANCH ────────────────────────────────────────────────
         if len(node) == 17:
+            node = list(node)                       # never mutate shared nodes
             if not key:
                 node[16] = value
             else:
@@ -180,16 +362,68 @@ class Trie:
 
     # ── DB helpers ─────────────────────────────────────────────────
 
-    def _resolve(self, child: Node) -> Node:
-        raw = self.db.get(child)  # type: ignore[arg-type]
+    def _load(self, child: bytes) -> bytes:
+        raw = self.db.get(child)
         if raw is None:
             raise ValueError(f"Missing node in DB: {child.hex()}")
-        return decode(raw)
+        return raw
+
+    def _resolve(self, child: Node) -> Node:
+        """Resolve a hash into a mutable node (a private copy)."""
+        return self._resolve_lazy(child).to_list()  # type: ignore[arg-type, union-attr]
+
+    def _resolve_lazy(self, child: bytes) -> Node:
+        if self.cache is None:
+            return decode_lazy(self._load(child))
+        node = self.cache.get(child)
+        if node is None:
+            node = self.cache.put(child, self._load(child))
+        return node
+
+    def _resolve_many(self, refs: Iterable[bytes]) -> Dict[bytes, Node]:
+        """Resolve hash references with at most one DB round trip."""
+        nodes: Dict[bytes, Node] = {}
+        missing = []
+        for ref in refs:
+            node = self.cache.get(ref) if self.cache is not None else None
+            if node is None:
+                missing.append(ref)
+            else:
+                nodes[ref] = node
+        if missing:
+            for ref, raw in self.db.get_many(missing).items():
+                if raw is None:
+                    raise ValueError(f"Missing node in DB: {ref.hex()}")
+                nodes[ref] = self.cache.put(ref, raw) if self.cache is not None else decode_lazy(raw)
+        return nodes
 
     def _store_node(self, node: Node) -> Node:
+        if self.deferred:                           # stays dirty until commit()
+            return node
         encoded = encode(node)
         if len(encoded) < 32:                       # inline if small
             return node
         h = keccak256(encoded)
-        self.db.put(h, encoded)
+        self._persist(h, encoded)
+        return h
+
+    def _persist(self, node_hash: bytes, encoded: bytes) -> None:
+        self.db.put(node_hash, encoded)
+        if self.cache is not None:
+            self.cache.put(node_hash, encoded)
+
+    def _commit_node(self, node: Node, writes: List[Tuple[bytes, bytes]]) -> Node:
+        """Replace dirty descendants of `node` with their references."""
+        if isinstance(node, bytes):                 # hash ref or empty slot
+            return node
+        if len(node) == 2:
+            _, is_leaf = decode_path(node[0])
+            node = [node[0], node[1] if is_leaf else self._commit_node(node[1], writes)]
+        else:
+            node = [self._commit_node(child, writes) for child in node[:16]] + [node[16]]
+        encoded = encode(node)
+        if len(encoded) < 32:
+            return node
+        h = keccak256(encoded)
+        writes.append((h, encoded))
         return h
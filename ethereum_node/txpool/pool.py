@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# txpool/pool.py
+#
+# Transaction pool: per-sender nonce queues plus a global price heap.
+#
+
+import heapq
+import itertools
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ethereum_node.block.transaction import Transaction
+
+DEFAULT_CAPACITY = 10_000
+PRICE_BUMP = 10          # percent a replacement must add to the old gas price
+
+
+class TxPoolError(Exception):
+    pass
+
+
+class SenderQueue:
+    """One sender's transactions by nonce.
+
+    Nonces `nonce` .. `pending_end - 1` are all present and executable in
+    order (pending); anything at or beyond the first gap is queued.
+    """
+
+    __slots__ = ("nonce", "pending_end", "txs")
+
+    def __init__(self, nonce: int):
+        self.nonce = nonce              # next nonce the chain expects
+        self.pending_end = nonce        # first missing nonce
+        self.txs: Dict[int, Transaction] = {}
+
+    def advance(self):
+        while self.pending_end in self.txs:
+            self.pending_end += 1
+
+    def pending(self) -> List[Transaction]:
+        return [self.txs[n] for n in range(self.nonce, self.pending_end)]
+
+    def queued(self) -> List[Transaction]:
+        return sorted((tx for n, tx in self.txs.items() if n >= self.pending_end), key=lambda tx: tx.nonce)
+
+
+class TxPool:
+    """Pending/queued transactions ordered by sender nonce and gas price.
+
+    add() is O(log n): a dict insert into the sender's queue and a push
+    onto a min-heap of all transactions by price. The heap serves eviction
+    at capacity (the cheapest transaction goes, with the same sender's
+    later nonces, which could no longer execute). Replaced and removed
+    transactions are dropped from the heap lazily.
+
+    `get_nonce(sender)` supplies the account nonce for senders the pool
+    has not seen yet.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        get_nonce: Callable[[bytes], int] = lambda sender: 0,
+        price_bump: int = PRICE_BUMP,
+    ):
+        self.capacity = capacity
+        self.get_nonce = get_nonce
+        self.price_bump = price_bump
+        self._senders: Dict[bytes, SenderQueue] = {}
+        self._by_hash: Dict[bytes, Transaction] = {}
+        self._heap: List[Tuple[int, int, bytes, int, bytes]] = []  # (price, seq, sender, nonce, hash)
+        self._seq = itertools.count()
+
+    # ── insertion ─────────────────────────────────────────────────────
+
+    def add(self, tx: Transaction) -> None:
+        sender = tx.sender
+        if sender is None:
+            raise TxPoolError("Transaction sender is not known")
+        tx_hash = tx.hash()
+        if tx_hash in self._by_hash:
+            raise TxPoolError("Known transaction")
+        queue = self._senders.get(sender)
+        if queue is None:
+            queue = SenderQueue(self.get_nonce(sender))
+        if tx.nonce < queue.nonce:
+            raise TxPoolError("Nonce too low")
+
+        old = queue.txs.get(tx.nonce)
+        if old is not None:
+            if tx.gas_price * 100 < old.gas_price * (100 + self.price_bump):
+                raise TxPoolError("Replacement transaction underpriced")
+            del self._by_hash[old.hash()]
+        elif len(self._by_hash) >= self.capacity:
+            cheapest = self._cheapest()
+            if cheapest is None or tx.gas_price <= cheapest.gas_price:
+                raise TxPoolError("Pool is full")
+            if cheapest.sender == sender and cheapest.nonce < tx.nonce:
+                raise TxPoolError("Pool is full")  # evicting would leave tx behind a gap
+            self._evict(cheapest)
+
+        self._senders[sender] = queue
+        queue.txs[tx.nonce] = tx
+        queue.advance()
+        self._by_hash[tx_hash] = tx
+        heapq.heappush(self._heap, (tx.gas_price, next(self._seq), sender, tx.nonce, tx_hash))
+        if len(self._heap) > 2 * len(self._by_hash) + 64:
+            self._compact()
+
+    # ── removal ───────────────────────────────────────────────────────
+
+    def set_nonce(self, sender: bytes, nonce: int) -> None:
+        """Account nonce moved: drop what a forward move made stale.
+
+        A backward move (reorg) leaves a gap below the held transactions,
+        so they are queued until it is filled.
+        """
+        queue = self._senders.get(sender)
+        if queue is None:
+            return
+        for n in [n for n in queue.txs if n < nonce]:
+            del self._by_hash[queue.txs.pop(n).hash()]
+        if nonce < queue.nonce:
+            queue.pending_end = nonce
+        else:
+            queue.pending_end = max(queue.pending_end, nonce)
+        queue.nonce = nonce
+        queue.advance()
+        if not queue.txs:
+            del self._senders[sender]
+
+    def remove(self, tx_hash: bytes) -> Optional[Transaction]:
+        """Drop one transaction; the sender's later nonces become queued."""
+        tx = self._by_hash.pop(tx_hash, None)
+        if tx is None:
+            return None
+        queue = self._senders[tx.sender]
+        del queue.txs[tx.nonce]
+        if tx.nonce < queue.pending_end:
+            queue.pending_end = tx.nonce
+        if not queue.txs:
+            del self._senders[tx.sender]
+        return tx
+
+    def _evict(self, tx: Transaction):
+        queue = self._senders[tx.sender]
+        for n in [n for n in queue.txs if n >= tx.nonce]:
+            self.remove(queue.txs[n].hash())
+
+    def _cheapest(self) -> Optional[Transaction]:
+        heap = self._heap
+        while heap:
+            _, _, _, _, tx_hash = heap[0]
+            tx = self._by_hash.get(tx_hash)
+            if tx is not None:
+                return tx
+            heapq.heappop(heap)         # stale: replaced or removed
+        return None
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[4] in self._by_hash]
+        heapq.heapify(self._heap)
+
+    # ── selection ─────────────────────────────────────────────────────
+
+    def best(self, n: Optional[int] = None) -> List[Transaction]:
+        """Up to `n` executable transactions, highest price first.
+
+        Nonce order is kept per sender: only each sender's next pending
+        transaction competes, and taking it exposes the one after. This
+        costs O(senders + n log senders) rather than a sort of the pool.
+        """
+        return list(itertools.islice(self._iter_best(), n))
+
+    def _iter_best(self) -> Iterator[Transaction]:
+        heads = []
+        for sender, queue in self._senders.items():
+            if queue.pending_end > queue.nonce:
+                tx = queue.txs[queue.nonce]
+                heads.append((-tx.gas_price, next(self._seq), sender, queue.nonce))
+        heapq.heapify(heads)
+        while heads:
+            _, _, sender, nonce = heapq.heappop(heads)
+            queue = self._senders[sender]
+            yield queue.txs[nonce]
+            nonce += 1
+            if nonce < queue.pending_end:
+                tx = queue.txs[nonce]
+                heapq.heappush(heads, (-tx.gas_price, next(self._seq), sender, nonce))
+
+    # ── inspection ────────────────────────────────────────────────────
+
+    def get(self, tx_hash: bytes) -> Optional[Transaction]:
+        return self._by_hash.get(tx_hash)
+
+    def pending(self, sender: bytes) -> List[Transaction]:
+        queue = self._senders.get(sender)
+        return queue.pending() if queue else []
+
+    def queued(self, sender: bytes) -> List[Transaction]:
+        queue = self._senders.get(sender)
+        return queue.queued() if queue else []
+
+    def stats(self) -> Tuple[int, int]:
+        """(pending, queued) transaction counts."""
+        pending = sum(q.pending_end - q.nonce for q in self._senders.values())
+        return pending, len(self._by_hash) - pending
+
+    def __contains__(self, tx_hash: bytes) -> bool:
+        return tx_hash in self._by_hash
+
+    def __len__(self):
+        return len(self._by_hash)
@@ -2,4 +2,6 @@ from eth_hash.auto import keccak
 
 
 def keccak256(data: bytes) -> bytes:
+    if isinstance(data, memoryview):
+        return keccak.hasher(data)  # eth_hash's type check rejects views
     return keccak(data)
@@ -0,0 +1,100 @@
+from typing import Any, Dict, Hashable, List
+
+MISSING = object()  # returned by DiffLayers.get for keys no layer has written
+
+
+class DiffLayers:
+    """Stack of write diffs with O(1) push and O(1) lookups.
+
+    Each layer holds only the keys written while it was on top. `_index`
+    maps a key to the depths of the layers that hold it, deepest last, so
+    a read goes straight to the newest write instead of walking the stack.
+    pop() discards the top layer and merge() folds it into the one below;
+    both cost O(keys in that layer).
+    """
+
+    def __init__(self):
+        self._layers: List[Dict[Hashable, Any]] = [{}]
+        self._index: Dict[Hashable, List[int]] = {}
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        depths = self._index.get(key)
+        if depths is None:
+            return default
+        return self._layers[depths[-1]][key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def set(self, key: Hashable, value: Any):
+        depth = len(self._layers) - 1
+        top = self._layers[depth]
+        if key not in top:
+            self._index.setdefault(key, []).append(depth)
+        top[key] = value
+
+    def push(self) -> int:
+        """Open a new top layer and return its depth."""
+        self._layers.append({})
+        return len(self._layers) - 1
+
+    def pop(self):
+        """Discard the top layer. The bottom layer is only ever cleared."""
+        if len(self._layers) == 1:
+            self.clear()
+            return
+        for key in self._layers.pop():
+            depths = self._index[key]
+            depths.pop()
+            if not depths:
+                del self._index[key]
+
+    def merge(self):
+        """Fold the top layer into the one below it."""
+        if len(self._layers) == 1:
+            return
+        top = self._layers.pop()
+        below = self._layers[-1]
+        depth = len(self._layers) - 1
+        for key, value in top.items():
+            depths = self._index[key]
+            if key in below:
+                depths.pop()
+            else:
+                depths[-1] = depth
+            below[key] = value
+
+    def flatten(self, depth: int = -1) -> Dict[Hashable, Any]:
+        """Remove layers 0..depth (all by default) and return their net writes.
+
+        Layers above `depth` stay, renumbered to sit on a fresh bottom layer.
+        """
+        if depth < 0:
+            depth = len(self._layers) - 1
+        merged: Dict[Hashable, Any] = {}
+        for layer in self._layers[: depth + 1]:
+            merged.update(layer)
+        upper = self._layers[depth + 1 :]
+        self.clear()
+        for layer in upper:
+            self.push()
+            for key, value in layer.items():
+                self.set(key, value)
+        return merged
+
+    def keys(self) -> List[Hashable]:
+        """Every key written in any layer, in no particular order."""
+        return list(self._index)
+
+    def clear(self):
+        self._layers = [{}]
+        self._index = {}
+
+    @property
+    def depth(self) -> int:
+        """Index of the top layer; 0 when no layer has been pushed."""
+        return len(self._layers) - 1
+
+    def __len__(self):
+        """Number of distinct keys written in any layer."""
+        return len(self._index)
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry.
+
+    `maxsize` is a budget in the units passed to put() (one per entry by
+    default), so the cache can be bounded by entry count or by bytes.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, size: int = 1) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self._data[key] = (value, size)
+        self.size += size
+        while self.size > self.maxsize and self._data:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.size -= evicted
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,24 +1,35 @@
-from typing import List, Tuple, Union
+from typing import Iterator, List, Sequence, Tuple, Union
 
 RLP = Union[bytes, int, List["RLP"]]  # Recursive type
 
 
 def encode(item: RLP) -> bytes:
-    if isinstance(item, int):
-        if item == 0:
-            return b"\x80"
-        elif item < 128:
-            return bytes([item])
-        else:
-            b = item.to_bytes((item.bit_length() + 7) // 8, "big")
-            return _encode_bytes(b)
-    elif isinstance(item, bytes):
-        return _encode_bytes(item)
-    elif isinstance(item, list):
-        encoded_elements = b"".join(encode(i) for i in item)
-        return _encode_length(len(encoded_elements), 0xC0) + encoded_elements
-    else:
-        raise TypeError(f"Unsupported RLP type: {type(item)}")
+    """Encode `item` into a single preallocated buffer.
+
+    A first pass measures every list payload; the second writes prefixes
+    and payloads in place, so no intermediate bytes are built per level.
+    """
+    sizes: List[int] = []
+    buf = bytearray(_measure(item, sizes))
+    _write(item, buf, 0, iter(sizes))
+    return bytes(buf)
+
+
+def encode_batch(items: Sequence[RLP]) -> Tuple[bytes, List[int]]:
+    """Encode `items` back to back into one buffer.
+
+    Returns the buffer and offsets such that item i is
+    buf[offsets[i]:offsets[i + 1]].
+    """
+    sizes: List[int] = []
+    offsets = [0]
+    for item in items:
+        offsets.append(offsets[-1] + _measure(item, sizes))
+    buf = bytearray(offsets[-1])
+    it = iter(sizes)
+    for item, start in zip(items, offsets):
+        _write(item, buf, start, it)
+    return bytes(buf), offsets
 
 
 def decode(encoded: bytes) -> RLP:
@@ -26,22 +37,245 @@ def decode(encoded: bytes) -> RLP:
     return item
 
 
+def decode_lazy(encoded: bytes) -> Union[bytes, "LazyList"]:
+    """Decode only the outermost item; lists come back as LazyList views."""
+    start, end, is_list = _item_bounds(encoded, 0)
+    if is_list:
+        return LazyList(encoded, start, end)
+    return encoded[start:end]
+
+
+def list_payload(encoded: bytes) -> bytes:
+    """The concatenated item encodings inside the list `encoded`."""
+    start, end, is_list = _item_bounds(encoded, 0)
+    if not is_list:
+        raise ValueError("RLP item is not a list")
+    return encoded[start:end]
+
+
+def wrap_list(payload: bytes) -> bytes:
+    """Encode already encoded items, concatenated in `payload`, as a list."""
+    length = len(payload)
+    buf = bytearray(_prefix_length(length) + length)
+    pos = _write_prefix(buf, 0, length, 0xC0)
+    buf[pos:] = payload
+    return bytes(buf)
+
+
+class LazyList:
+    """An RLP list that is decoded on access.
+
+    Item boundaries are found by reading prefixes only, the first time
+    they are needed. decode_at() copies out just the requested byte string,
+    and nested lists come back as further views into the same buffer.
+
+    Indexing mutates the view, so an instance shared between threads must
+    be fully indexed first (index_items()); after that it is read-only.
+    """
+
+    __slots__ = ("_data", "_start", "_end", "_items", "_pos")
+
+    def __init__(self, data: bytes, start: int, end: int):
+        self._data = data
+        self._start = start  # payload bounds within `data`
+        self._end = end
+        self._items: List[Tuple[int, int, int, bool]] = []
+        self._pos = start    # scan position: items before it are indexed
+
+    def _scan(self, index: int) -> List[Tuple[int, int, int, bool]]:
+        """Index item boundaries up to `index` (-1 for all of them)."""
+        items = self._items
+        data = self._data
+        pos = self._pos
+        end = self._end
+        while pos < end and (index < 0 or len(items) <= index):
+            prefix = data[pos]
+            if prefix <= 0x7F:
+                bounds = (pos, pos, pos + 1, False)
+            elif prefix <= 0xB7:
+                bounds = (pos, pos + 1, pos + 1 + prefix - 0x80, False)
+            else:
+                bounds = (pos,) + _item_bounds(data, pos)
+            items.append(bounds)
+            pos = bounds[2]
+        self._pos = pos
+        return items
+
+    def index_items(self) -> "LazyList":
+        """Index every item boundary now, so later access never writes."""
+        self._scan(-1)
+        return self
+
+    def decode_at(self, index: int) -> Union[bytes, "LazyList"]:
+        items = self._items
+        if index < 0 or index >= len(items):
+            items = self._scan(index)
+        _, start, end, is_list = items[index]
+        if is_list:
+            return LazyList(self._data, start, end)
+        return self._data[start:end]
+
+    def raw_at(self, index: int) -> memoryview:
+        """Zero-copy view of the full encoding of item `index`."""
+        pos, _, end, _ = self._scan(index)[index]
+        return memoryview(self._data)[pos:end]
+
+    def to_list(self) -> List[RLP]:
+        """Fully decode, with the same result as decode()."""
+        return [
+            item.to_list() if isinstance(item, LazyList) else item
+            for item in map(self.decode_at, range(len(self)))
+        ]
+
+    __getitem__ = decode_at
+
+    def __len__(self) -> int:
+        return len(self._scan(-1))
+
+    def __iter__(self):
+        return map(self.decode_at, range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyList):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"LazyList({self.to_list()!r})"
+
+
 # --- Internal helpers ---
 
 
-def _encode_bytes(b: bytes) -> bytes:
-    if len(b) == 1 and b[0] < 128:
-        return b
+def _int_to_bytes(item: int) -> bytes:
+    return item.to_bytes((item.bit_length() + 7) // 8, "big")
+
+
+def _prefix_length(length: int) -> int:
+    return 1 if length < 56 else 1 + (length.bit_length() + 7) // 8
+
+
+def _measure(item: RLP, sizes: List[int]) -> int:
+    """Return the encoded length of `item`, recording list payload sizes
+    in pre-order."""
+    if isinstance(item, bytes):
+        length = len(item)
+        if length == 1 and item[0] < 128:
+            return 1
+        return _prefix_length(length) + length
+    elif isinstance(item, list):
+        slot = len(sizes)
+        sizes.append(0)
+        payload = 0
+        for child in item:
+            if type(child) is bytes:              # inline the common case
+                length = len(child)
+                if length == 1 and child[0] < 128:
+                    payload += 1
+                elif length < 56:
+                    payload += 1 + length
+                else:
+                    payload += _prefix_length(length) + length
+            elif type(child) is int and child >= 0:
+                if child < 128:
+                    payload += 1
+                else:
+                    length = (child.bit_length() + 7) // 8
+                    payload += _prefix_length(length) + length
+            else:
+                payload += _measure(child, sizes)
+        sizes[slot] = payload
+        return _prefix_length(payload) + payload
+    elif isinstance(item, int):
+        if item < 128:
+            return 1
+        return _measure(_int_to_bytes(item), sizes)
     else:
-        return _encode_length(len(b), 0x80) + b
+        raise TypeError(f"Unsupported RLP type: {type(item)}")
 
 
-def _encode_length(length: int, offset: int) -> bytes:
+def _write_prefix(buf: bytearray, pos: int, length: int, offset: int) -> int:
     if length < 56:
-        return bytes([offset + length])
+        buf[pos] = offset + length
+        return pos + 1
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    buf[pos] = offset + 55 + len(length_bytes)
+    end = pos + 1 + len(length_bytes)
+    buf[pos + 1 : end] = length_bytes
+    return end
+
+
+def _write(item: RLP, buf: bytearray, pos: int, sizes: Iterator[int]) -> int:
+    """Write `item` at `pos`, consuming list sizes from `_measure`."""
+    if isinstance(item, int):
+        if item == 0:
+            buf[pos] = 0x80
+            return pos + 1
+        if item < 128:
+            buf[pos] = item
+            return pos + 1
+        item = _int_to_bytes(item)
+    if isinstance(item, bytes):
+        length = len(item)
+        if length == 1 and item[0] < 128:
+            buf[pos] = item[0]
+            return pos + 1
+        pos = _write_prefix(buf, pos, length, 0x80)
+        buf[pos : pos + length] = item
+        return pos + length
+    pos = _write_prefix(buf, pos, next(sizes), 0xC0)
+    for child in item:
+        if type(child) is bytes:                  # inline the common case
+            length = len(child)
+            if length == 1 and child[0] < 128:
+                buf[pos] = child[0]
+                pos += 1
+                continue
+            if length < 56:
+                buf[pos] = 0x80 + length
+                pos += 1
+            else:
+                pos = _write_prefix(buf, pos, length, 0x80)
+            buf[pos : pos + length] = child
+            pos += length
+        elif type(child) is int and child >= 0:
+            if child < 128:
+                buf[pos] = child or 0x80
+                pos += 1
+                continue
+            length = (child.bit_length() + 7) // 8
+            pos = _write_prefix(buf, pos, length, 0x80)
+            buf[pos : pos + length] = child.to_bytes(length, "big")
+            pos += length
+        else:
+            pos = _write(child, buf, pos, sizes)
+    return pos
+
+
+def _item_bounds(data: bytes, pos: int) -> Tuple[int, int, bool]:
+    """Return (payload start, payload end, is_list) of the item at `pos`."""
+    if pos >= len(data):
+        raise ValueError("Unexpected end of RLP data")
+
+    prefix = data[pos]
+    if prefix <= 0x7F:
+        return pos, pos + 1, False
+    elif prefix <= 0xB7:
+        return pos + 1, pos + 1 + prefix - 0x80, False
+    elif prefix <= 0xBF:
+        lenlen = prefix - 0xB7
+        start = pos + 1 + lenlen
+        return start, start + int.from_bytes(data[pos + 1 : start], "big"), False
+    elif prefix <= 0xF7:
+        return pos + 1, pos + 1 + prefix - 0xC0, True
     else:
-        length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
-        return bytes([offset + 55 + len(length_bytes)]) + length_bytes
+        lenlen = prefix - 0xF7
+        start = pos + 1 + lenlen
+        return start, start + int.from_bytes(data[pos + 1 : start], "big"), True
 
 
 def _decode_item(data: bytes, pos: int) -> Tuple[RLP, int]:
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# utils/secp256k1.py
+#
+# Pure-Python secp256k1 ECDSA: enough for signing and public key recovery.
+# Points are kept in Jacobian coordinates so a scalar multiplication needs
+# a single field inversion at the end.
+#
+
+import hashlib
+import hmac
+from typing import Optional, Tuple
+
+P = 2**256 - 2**32 - 977
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+GX = 0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798
+GY = 0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8
+
+Jacobian = Tuple[int, int, int]          # (X, Y, Z); Z == 0 is the point at infinity
+INFINITY: Jacobian = (0, 0, 0)
+G: Jacobian = (GX, GY, 1)
+
+
+def _double(p: Jacobian) -> Jacobian:
+    x, y, z = p
+    if not y or not z:
+        return INFINITY
+    ysq = y * y % P
+    s = 4 * x * ysq % P
+    m = 3 * x * x % P                    # a = 0 on secp256k1
+    nx = (m * m - 2 * s) % P
+    ny = (m * (s - nx) - 8 * ysq * ysq) % P
+    nz = 2 * y * z % P
+    return nx, ny, nz
+
+
+def _add(p: Jacobian, q: Jacobian) -> Jacobian:
+    if not p[2]:
+        return q
+    if not q[2]:
+        return p
+    x1, y1, z1 = p
+    x2, y2, z2 = q
+    z1sq = z1 * z1 % P
+    z2sq = z2 * z2 % P
+    u1 = x1 * z2sq % P
+    u2 = x2 * z1sq % P
+    s1 = y1 * z2sq * z2 % P
+    s2 = y2 * z1sq * z1 % P
+    if u1 == u2:
+        return _double(p) if s1 == s2 else INFINITY
+    h = (u2 - u1) % P
+    r = (s2 - s1) % P
+    h2 = h * h % P
+    h3 = h * h2 % P
+    u1h2 = u1 * h2 % P
+    nx = (r * r - h3 - 2 * u1h2) % P
+    ny = (r * (u1h2 - nx) - s1 * h3) % P
+    nz = h * z1 * z2 % P
+    return nx, ny, nz
+
+
+def _multiply(p: Jacobian, k: int) -> Jacobian:
+    result = INFINITY
+    addend = p
+    while k:
+        if k & 1:
+            result = _add(result, addend)
+        addend = _double(addend)
+        k >>= 1
+    return result
+
+
+def _shamir(p: Jacobian, a: int, q: Jacobian, b: int) -> Jacobian:
+    """a*p + b*q with one shared doubling chain."""
+    both = _add(p, q)
+    result = INFINITY
+    for i in range(max(a.bit_length(), b.bit_length()) - 1, -1, -1):
+        result = _double(result)
+        bits = ((a >> i) & 1, (b >> i) & 1)
+        if bits == (1, 1):
+            result = _add(result, both)
+        elif bits[0]:
+            result = _add(result, p)
+        elif bits[1]:
+            result = _add(result, q)
+    return result
+
+
+def _to_affine(p: Jacobian) -> Tuple[int, int]:
+    x, y, z = p
+    zinv = pow(z, -1, P)
+    zinv2 = zinv * zinv % P
+    return x * zinv2 % P, y * zinv2 * zinv % P
+
+
+def _encode_point(p: Jacobian) -> bytes:
+    x, y = _to_affine(p)
+    return x.to_bytes(32, "big") + y.to_bytes(32, "big")
+
+
+def private_key_to_public_key(private_key: bytes) -> bytes:
+    """64-byte uncompressed public key (x || y, no 0x04 prefix)."""
+    k = int.from_bytes(private_key, "big")
+    if not 0 < k < N:
+        raise ValueError("Invalid private key")
+    return _encode_point(_multiply(G, k))
+
+
+def _deterministic_k(msg_hash: bytes, private_key: bytes) -> int:
+    # RFC 6979 with HMAC-SHA256.
+    v = b"\x01" * 32
+    k = b"\x00" * 32
+    k = hmac.new(k, v + b"\x00" + private_key + msg_hash, hashlib.sha256).digest()
+    v = hmac.new(k, v, hashlib.sha256).digest()
+    k = hmac.new(k, v + b"\x01" + private_key + msg_hash, hashlib.sha256).digest()
+    v = hmac.new(k, v, hashlib.sha256).digest()
+    while True:
+        v = hmac.new(k, v, hashlib.sha256).digest()
+        candidate = int.from_bytes(v, "big")
+        if 0 < candidate < N:
+            return candidate
+        k = hmac.new(k, v + b"\x00", hashlib.sha256).digest()
+        v = hmac.new(k, v, hashlib.sha256).digest()
+
+
+def sign(msg_hash: bytes, private_key: bytes) -> Tuple[int, int, int]:
+    """Return (recovery id 0/1, r, s) with s in the lower half of the order."""
+    d = int.from_bytes(private_key, "big")
+    z = int.from_bytes(msg_hash, "big")
+    k = _deterministic_k(msg_hash, private_key)
+    rx, ry = _to_affine(_multiply(G, k))
+    r = rx % N
+    s = pow(k, -1, N) * (z + r * d) % N
+    recovery_id = (ry & 1) | (2 if rx >= N else 0)
+    if s > N // 2:
+        s = N - s
+        recovery_id ^= 1
+    return recovery_id, r, s
+
+
+def recover_public_key(msg_hash: bytes, recovery_id: int, r: int, s: int) -> Optional[bytes]:
+    """Public key that produced (r, s) over `msg_hash`, or None if invalid."""
+    if not (0 < r < N and 0 < s < N) or recovery_id not in (0, 1, 2, 3):
+        return None
+    x = r + N if recovery_id & 2 else r
+    if x >= P:
+        return None
+    alpha = (x * x * x + 7) % P
+    y = pow(alpha, (P + 1) // 4, P)
+    if y * y % P != alpha:
+        return None
+    if (y & 1) != (recovery_id & 1):
+        y = P - y
+    rinv = pow(r, -1, N)
+    e = int.from_bytes(msg_hash, "big")
+    q = _shamir(G, (-e * rinv) % N, (x, y, 1), s * rinv % N)
+    if not q[2]:
+        return None
+    return _encode_point(q)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Measure block-commit throughput of KeyValueDB.
+
+Each "commit" writes --nodes trie-node-sized values, either one
+transaction per put (the old path) or through a single WriteBatch.
+Run from the repository root: PYTHONPATH=. python scripts/bench_kv.py
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from ethereum_node.db.kv import KeyValueDB
+
+
+def run(nodes: int, commits: int, batched: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = KeyValueDB(os.path.join(tmpdir, "bench.db"))
+        value = os.urandom(532)  # full branch node
+        start = time.perf_counter()
+        for c in range(commits):
+            keys = [os.urandom(32) for _ in range(nodes)]
+            if batched:
+                with db.write_batch() as batch:
+                    for key in keys:
+                        batch.put(key, value)
+            else:
+                for key in keys:
+                    db.put(key, value)
+        elapsed = time.perf_counter() - start
+        db.close()
+    return commits / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=1000, help="nodes per commit")
+    parser.add_argument("--commits", type=int, default=5)
+    args = parser.parse_args()
+    for batched in (False, True):
+        rate = run(args.nodes, args.commits, batched)
+        label = "write batch" if batched else "put per txn"
+        print(f"{label:12s} {rate:8.2f} commits/s  ({rate * args.nodes:,.0f} puts/s)")
+
+
+if __name__ == "__main__":
+    main()
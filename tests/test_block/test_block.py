@@ -0,0 +1,24 @@
+from dataclasses import replace
+
+from ethereum_node.block.block import Block
+from ethereum_node.block.header import BlockHeader
+from ethereum_node.utils.rlp import decode
+
+
+def make_header():
+    return BlockHeader(
+        parent_hash=b'\x01' * 32, ommers_hash=b'\x02' * 32, coinbase=b'\x03' * 20,
+        state_root=b'\x04' * 32, transactions_root=b'\x05' * 32, receipts_root=b'\x06' * 32,
+        logs_bloom=b'\x00' * 256, difficulty=1, number=1, gas_limit=5000,
+        gas_used=0, timestamp=0, extra_data=b"", mix_hash=b'\x07' * 32, nonce=b'\x08' * 8,
+    )
+
+
+def test_rlp_memoized_until_header_changes():
+    block = Block(make_header(), [b"tx1", b"tx2"], [])
+    first = block.rlp()
+    assert block.rlp() is first
+    block.header = replace(block.header, number=9)
+    assert block.rlp() != first
+    assert decode(block.rlp())[1] == [b"tx1", b"tx2"]
+    assert block.hash() == block.header.hash()
@@ -0,0 +1,60 @@
+from ethereum_node.block.chain import HeaderChain
+from ethereum_node.block.header import BlockHeader
+from ethereum_node.db.memory import MemoryDB
+
+
+def make_header(parent_hash, number, extra=b""):
+    return BlockHeader(
+        parent_hash=parent_hash, ommers_hash=b'\x00' * 32, coinbase=b'\x00' * 20,
+        state_root=b'\x00' * 32, transactions_root=b'\x00' * 32, receipts_root=b'\x00' * 32,
+        logs_bloom=b'\x00' * 256, difficulty=1, number=number, gas_limit=5000,
+        gas_used=0, timestamp=number, extra_data=extra, mix_hash=b'\x00' * 32, nonce=b'\x00' * 8,
+    )
+
+
+def build(chain, parent_hash, start, count, extra=b""):
+    hashes = []
+    for number in range(start, start + count):
+        parent_hash = chain.add_header(make_header(parent_hash, number, extra), canonical=True)
+        hashes.append(parent_hash)
+    return hashes
+
+
+def test_lookups_by_hash_and_number():
+    chain = HeaderChain(MemoryDB())
+    hashes = build(chain, b'\x00' * 32, 0, 10)
+    assert chain.head_hash == hashes[-1]
+    assert chain.get_canonical_hash(4) == hashes[4]
+    assert chain.get_header_by_number(7).hash() == hashes[7]
+    assert chain.get_header_by_number(10) is None
+
+
+def test_headers_survive_reopen():
+    db = MemoryDB()
+    hashes = build(HeaderChain(db), b'\x00' * 32, 0, 3)
+    reopened = HeaderChain(db)
+    assert reopened.head.number == 2
+    assert reopened.get_header(hashes[1]).number == 1
+
+
+def test_reorg_rewrites_only_diverging_numbers():
+    chain = HeaderChain(MemoryDB())
+    main = build(chain, b'\x00' * 32, 0, 6)
+    side = build(chain, main[2], 3, 2, extra=b"side")  # shorter fork from block 2
+    assert chain.head_hash == side[-1]
+    assert chain.get_canonical_hash(3) == side[0]
+    assert chain.get_canonical_hash(5) is None
+    assert chain.get_canonical_hash(2) == main[2]
+    assert not chain.is_canonical(main[4])
+
+
+def test_ancestor_hash():
+    chain = HeaderChain(MemoryDB())
+    main = build(chain, b'\x00' * 32, 0, 8)
+    fork = main[5]
+    for number in (6, 7):
+        fork = chain.add_header(make_header(fork, number, b"fork"))
+    assert chain.get_ancestor_hash(main[7], 3) == main[4]
+    assert chain.get_ancestor_hash(fork, 2) == main[5]
+    assert chain.get_ancestor_hash(fork, 4) == main[3]
+    assert chain.get_ancestor_hash(main[2], 5) is None
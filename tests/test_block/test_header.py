@@ -0,0 +1,53 @@
+from dataclasses import replace
+
+import pytest
+
+from ethereum_node.block.header import BlockHeader
+from ethereum_node.utils.hash import keccak256
+from ethereum_node.utils.rlp import encode
+
+
+def make_header(**overrides):
+    fields = dict(
+        parent_hash=b'\x01' * 32, ommers_hash=b'\x02' * 32, coinbase=b'\x03' * 20,
+        state_root=b'\x04' * 32, transactions_root=b'\x05' * 32, receipts_root=b'\x06' * 32,
+        logs_bloom=b'\x00' * 256, difficulty=131072, number=1, gas_limit=5000,
+        gas_used=0, timestamp=1438269988, extra_data=b"", mix_hash=b'\x07' * 32, nonce=b'\x08' * 8,
+    )
+    fields.update(overrides)
+    return BlockHeader(**fields)
+
+
+def test_from_rlp_round_trip():
+    header = make_header()
+    decoded = BlockHeader.from_rlp(header.rlp())
+    assert decoded == header
+    assert decoded.hash() == keccak256(header.rlp())
+
+
+def test_hash_cached_and_invalidated():
+    header = make_header()
+    first = header.hash()
+    assert header.hash() is first
+    changed = replace(header, number=2)
+    assert changed.hash() != first
+    assert changed.hash() == make_header(number=2).hash()
+
+
+def test_from_rlp_rejects_wrong_field_count():
+    with pytest.raises(ValueError):
+        BlockHeader.from_rlp(encode([b"a", b"b"]))
+
+
+def test_slotted():
+    assert not hasattr(make_header(), "__dict__")
+
+
+def test_seal_hash_survives_sealing_only():
+    header = make_header()
+    seal_hash = header.seal_hash()
+    assert seal_hash == keccak256(encode(header._fields()))
+    sealed = header.with_seal(b'\x02' * 32, b'\x01' * 8)
+    assert sealed._seal_hash == seal_hash
+    assert sealed.rlp() != header.rlp()
+    assert replace(sealed, gas_used=1).seal_hash() != seal_hash
@@ -0,0 +1,162 @@
+from dataclasses import replace
+
+import pytest
+
+from ethereum_node.block.block import Block
+from ethereum_node.block.chain import HeaderChain
+from ethereum_node.block.header import BlockHeader
+from ethereum_node.block.importer import BlockImportError, BlockImporter, apply_transaction, transactions_root
+from ethereum_node.block.ingest import TxIngestor
+from ethereum_node.block.transaction import Transaction
+from ethereum_node.db.memory import MemoryDB
+from ethereum_node.state.account import Account
+from ethereum_node.state.state import EMPTY_CODE_HASH, State
+from ethereum_node.state.trie import EMPTY_ROOT
+from ethereum_node.utils.secp256k1 import sign
+
+KEY = bytes.fromhex("46" * 32)
+SENDER = bytes.fromhex("9d8a62f656a8d1615c1294fd71e9cfb3e4855a4f")
+RECIPIENT = b'\x01' * 20
+COINBASE = b'\x02' * 20
+GAS_LIMIT = 1_000_000
+
+
+def signed(nonce, value=1000, gas=21000):
+    tx = Transaction(nonce=nonce, gas_price=2, gas=gas, to=RECIPIENT, value=value, data=b"", v=37)
+    recovery_id, r, s = sign(tx.signing_hash(), KEY)
+    return replace(tx, v=tx.v + recovery_id, r=r, s=s).rlp()
+
+
+def genesis(state_root):
+    return BlockHeader(
+        parent_hash=b'\x00' * 32, ommers_hash=b'\x00' * 32, coinbase=COINBASE,
+        state_root=state_root, transactions_root=EMPTY_ROOT, receipts_root=EMPTY_ROOT,
+        logs_bloom=b'\x00' * 256, difficulty=1, number=0, gas_limit=GAS_LIMIT,
+        gas_used=0, timestamp=0, extra_data=b"", mix_hash=b'\x00' * 32, nonce=b'\x00' * 8,
+    )
+
+
+def build_blocks(db, parent, count, per_block=3, gas=21000):
+    """Execute on a scratch State over a copy of `db` to fill in the roots."""
+    scratch = MemoryDB()
+    scratch.apply_batch(dict(db.iterate()))
+    state = State(scratch)
+    state.trie.root = parent.state_root
+    blocks, nonce = [], 0
+    for _ in range(count):
+        raws = [signed(nonce + i, gas=gas) for i in range(per_block)]
+        gas_used = 0
+        for raw in raws:
+            tx = Transaction.from_rlp(raw).with_sender(SENDER)
+            gas_used += apply_transaction(state, tx, COINBASE)
+        nonce += per_block
+        state.commit()
+        header = replace(
+            parent, parent_hash=parent.hash(), number=parent.number + 1, timestamp=parent.timestamp + 12,
+            state_root=state.state_root(), transactions_root=transactions_root(raws), gas_used=gas_used,
+        )
+        blocks.append(Block(header, raws, []))
+        parent = header
+    return blocks
+
+
+@pytest.fixture
+def node():
+    db = MemoryDB()
+    state = State(db)
+    state.set_account(SENDER, Account(0, 10**18, EMPTY_ROOT, EMPTY_CODE_HASH))
+    state.commit()
+    chain = HeaderChain(db)
+    chain.add_header(genesis(state.state_root()), canonical=True)
+    with TxIngestor(chain_id=1) as ingestor:
+        yield db, state, chain, BlockImporter(state, chain, ingestor)
+
+
+def test_imports_segment(node):
+    db, state, chain, importer = node
+    blocks = build_blocks(db, chain.head, 6)
+    hashes = importer.import_blocks(blocks)
+    assert hashes == [block.hash() for block in blocks]
+    assert chain.head_hash == hashes[-1]
+    assert state.state_root() == blocks[-1].header.state_root
+    assert state.get_account(SENDER).nonce == 18
+    assert state.get_account(RECIPIENT).balance == 18 * 1000
+    assert state.get_account(COINBASE).balance == 18 * 21000 * 2
+
+    # everything reached the backing DB
+    reopened = State(db)
+    reopened.trie.root = chain.head.state_root
+    assert reopened.get_account(RECIPIENT).balance == 18 * 1000
+
+
+def test_bad_block_keeps_earlier_blocks(node):
+    db, state, chain, importer = node
+    blocks = build_blocks(db, chain.head, 4)
+    blocks[2].header = replace(blocks[2].header, state_root=b'\x11' * 32)
+    blocks[3].header = replace(blocks[3].header, parent_hash=blocks[2].header.hash())
+    with pytest.raises(BlockImportError, match="state root"):
+        importer.import_blocks(blocks)
+    assert chain.head_hash == blocks[1].hash()
+    assert state.get_account(SENDER).nonce == 6
+    assert state.state_root() == blocks[1].header.state_root
+
+
+def test_rejects_wrong_transactions_root(node):
+    db, state, chain, importer = node
+    [block] = build_blocks(db, chain.head, 1)
+    block.transactions = block.transactions[:2]
+    with pytest.raises(BlockImportError, match="transactions root"):
+        importer.import_blocks([block])
+    assert chain.head.number == 0
+
+
+def test_tx_gas_limits_may_sum_above_block_limit(node):
+    db, state, chain, importer = node
+    [block] = build_blocks(db, chain.head, 1, per_block=3, gas=GAS_LIMIT // 2)
+    assert block.header.gas_used == 3 * 21000
+    importer.import_blocks([block])
+    assert chain.head_hash == block.hash()
+
+
+def test_rejects_tx_gas_above_remaining_block_gas(node):
+    db, state, chain, importer = node
+    [block] = build_blocks(db, chain.head, 1, per_block=2, gas=GAS_LIMIT - 21000 + 1)
+    with pytest.raises(BlockImportError, match="remaining gas"):
+        importer.import_blocks([block])
+    assert state.get_account(SENDER).nonce == 0
+
+
+def test_unexpected_error_reverts_block(node, monkeypatch):
+    db, state, chain, importer = node
+    [block] = build_blocks(db, chain.head, 1)
+    calls = []
+
+    def failing(state, tx, coinbase):
+        calls.append(tx)
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        return apply_transaction(state, tx, coinbase)
+
+    monkeypatch.setattr("ethereum_node.block.importer.apply_transaction", failing)
+    with pytest.raises(RuntimeError):
+        importer.import_blocks([block])
+    assert state.get_account(SENDER).nonce == 0
+    assert state.get_account(RECIPIENT) is None
+
+
+def test_commit_failure_is_chained_to_import_error(node, monkeypatch):
+    db, state, chain, importer = node
+    blocks = build_blocks(db, chain.head, 2)
+    blocks[1].header = replace(blocks[1].header, state_root=b'\x11' * 32)
+    monkeypatch.setattr(importer, "_commit", lambda dirty, header: (_ for _ in ()).throw(OSError("disk full")))
+    with pytest.raises(BlockImportError, match="state root") as exc:
+        importer.import_blocks(blocks)
+    assert isinstance(exc.value.__cause__, OSError)
+
+
+def test_commit_failure_raised_after_good_blocks(node, monkeypatch):
+    db, state, chain, importer = node
+    blocks = build_blocks(db, chain.head, 2)
+    monkeypatch.setattr(importer, "_commit", lambda dirty, header: (_ for _ in ()).throw(OSError("disk full")))
+    with pytest.raises(OSError):
+        importer.import_blocks(blocks)
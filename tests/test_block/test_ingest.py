@@ -0,0 +1,61 @@
+from dataclasses import replace
+
+import pytest
+
+from ethereum_node.block.ingest import InvalidTransaction, TxIngestor
+from ethereum_node.block.transaction import Transaction
+from ethereum_node.utils.secp256k1 import sign
+
+KEY = bytes.fromhex("46" * 32)
+SENDER = bytes.fromhex("9d8a62f656a8d1615c1294fd71e9cfb3e4855a4f")
+
+# EIP-155 example transaction
+EIP155_TX = Transaction(
+    nonce=9, gas_price=20 * 10**9, gas=21000, to=b'\x35' * 20, value=10**18, data=b"", v=37,
+    r=18515461264373351373200002665853028612451056578545711640558177340181847433846,
+    s=46948507304638947509940763649030358759909902576025900602547168820602576006531,
+)
+
+
+def signed(nonce, data=b"", gas=21000, chain_id=1):
+    tx = Transaction(nonce=nonce, gas_price=1, gas=gas, to=b'\x01' * 20, value=0, data=data, v=35 + 2 * chain_id)
+    recovery_id, r, s = sign(tx.signing_hash(), KEY)
+    return replace(tx, v=tx.v + recovery_id, r=r, s=s).rlp()
+
+
+def test_eip155_vector():
+    assert EIP155_TX.signing_hash().hex() == "daf5a779ae972f972197303d7b574746c7ef83eadac0f2791ad23db92e4c8e53"
+    with TxIngestor(chain_id=1) as ingestor:
+        [tx] = ingestor.ingest([EIP155_TX.rlp()])
+    assert tx.sender == SENDER
+
+
+def test_intrinsic_gas_and_chain_checks():
+    with TxIngestor(chain_id=1) as ingestor:
+        results = ingestor.process([
+            signed(0, data=b"\x00\x01", gas=21000),     # needs 21000 + 4 + 16
+            signed(1, chain_id=5),
+            b"\xc0",
+            signed(2, data=b"\x00\x01", gas=21020),
+        ])
+    assert [type(r) for r in results] == [InvalidTransaction, InvalidTransaction, InvalidTransaction, Transaction]
+    assert results[3].sender == SENDER
+    with pytest.raises(InvalidTransaction):
+        TxIngestor(chain_id=1).ingest([b"\xc0"])
+
+
+def test_senders_cached_by_hash(monkeypatch):
+    raw = signed(0)
+    ingestor = TxIngestor()
+    ingestor.ingest([raw])
+    monkeypatch.setattr(ingestor, "_recover", lambda txs: pytest.fail("recovered twice"))
+    assert ingestor.ingest([raw])[0].sender == SENDER
+    assert ingestor.sender_of(Transaction.from_rlp(raw)) == SENDER
+
+
+def test_parallel_recovery():
+    raws = [signed(n) for n in range(40)]
+    with TxIngestor(workers=2) as ingestor:
+        txs = ingestor.ingest(raws)
+    assert [tx.nonce for tx in txs] == list(range(40))
+    assert {tx.sender for tx in txs} == {SENDER}
@@ -0,0 +1,33 @@
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from ethereum_node.block.transaction import InvalidTransaction, Transaction
+from ethereum_node.utils.hash import keccak256
+
+
+def test_from_rlp_round_trip():
+    tx = Transaction(nonce=9, gas_price=20 * 10**9, gas=21000, to=b'\x35' * 20,
+                     value=10**18, data=b"", v=37, r=1, s=2)
+    decoded = Transaction.from_rlp(tx.rlp())
+    assert decoded == tx
+    assert decoded.hash() == keccak256(tx.rlp())
+
+
+def test_with_sender_keeps_cached_hash():
+    tx = Transaction(nonce=0, gas_price=1, gas=21000, to=b"", value=0, data=b"")
+    first = tx.hash()
+    with_sender = tx.with_sender(b'\x01' * 20)
+    assert with_sender.sender == b'\x01' * 20
+    assert with_sender.hash() is first
+    with pytest.raises(FrozenInstanceError):
+        tx.nonce = 1
+    assert replace(tx, nonce=1).hash() != first
+
+
+def test_malformed_v_is_invalid():
+    tx = Transaction(nonce=0, gas_price=1, gas=21000, to=b"", value=0, data=b"", v=30, r=1, s=2)
+    with pytest.raises(InvalidTransaction):
+        tx.signing_hash()
+    with pytest.raises(InvalidTransaction):
+        Transaction.from_rlp(tx.rlp())
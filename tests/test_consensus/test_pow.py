@@ -0,0 +1,69 @@
+import threading
+from dataclasses import replace
+
+import pytest
+
+from ethereum_node.block.header import BlockHeader
+from ethereum_node.consensus import pow as pow_module
+from ethereum_node.consensus.pow import InvalidSeal, PoWMiner, PoWVerifier, _search, check_pow, pow_target
+
+
+def make_header(difficulty, number=1):
+    return BlockHeader(
+        parent_hash=b'\x00' * 32, ommers_hash=b'\x00' * 32, coinbase=b'\x00' * 20,
+        state_root=b'\x00' * 32, transactions_root=b'\x00' * 32, receipts_root=b'\x00' * 32,
+        logs_bloom=b'\x00' * 256, difficulty=difficulty, number=number, gas_limit=5000,
+        gas_used=0, timestamp=1, extra_data=b"", mix_hash=b'\x00' * 32, nonce=b'\x00' * 8,
+    )
+
+
+def seal(header):
+    nonce, _ = _search(header.seal_hash(), 0, 1 << 20, pow_target(header.difficulty))
+    return header.with_seal(header.mix_hash, nonce.to_bytes(8, "big"))
+
+
+def test_search_patches_nonce_after_seal_hash():
+    header = make_header(1000)
+    nonce, attempts = _search(header.seal_hash(), 0, 1 << 20, pow_target(1000))
+    assert nonce is not None and attempts == nonce + 1
+    assert check_pow(header.with_seal(header.mix_hash, nonce.to_bytes(8, "big")))
+
+
+def test_mine_across_workers():
+    header = make_header(5000)
+    with PoWMiner(workers=2, chunk_size=512) as miner:
+        sealed = miner.mine(header)
+        assert sealed.seal_hash() == header.seal_hash()
+        assert check_pow(sealed)
+        assert miner.hashes > 0 and miner.hashrate > 0
+
+
+def test_cancel_stops_search():
+    header = make_header(2**200)
+    with PoWMiner(workers=2, chunk_size=1 << 14) as miner:
+        threading.Timer(0.3, miner.cancel).start()
+        assert miner.mine(header) is None
+        assert miner.elapsed < 10
+        assert header.nonce == b'\x00' * 8
+
+
+def test_verify_headers_reports_first_bad_seal():
+    headers = [seal(make_header(64, number=n)) for n in range(1, 4)]
+    with PoWVerifier() as verifier:
+        verifier.verify_headers(headers)
+        headers[1:] = [replace(header, difficulty=2**200) for header in headers[1:]]
+        with pytest.raises(InvalidSeal) as exc:
+            verifier.verify_headers(headers)
+    assert exc.value.index == 1
+
+
+def test_parallel_verification_memoizes_seal_hashes(monkeypatch):
+    monkeypatch.setattr(pow_module, "VERIFY_PARALLEL_THRESHOLD", 4)
+    sealed = seal(make_header(16))
+    headers = [BlockHeader.from_rlp(sealed.rlp()) for _ in range(10)]
+    headers[7] = replace(headers[7], difficulty=2**200)
+    with PoWVerifier(workers=2, chunk_size=3) as verifier:
+        with pytest.raises(InvalidSeal) as exc:
+            verifier.verify_headers(headers)
+    assert exc.value.index == 7
+    assert headers[0]._seal_hash == sealed.seal_hash()
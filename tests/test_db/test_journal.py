@@ -58,3 +58,73 @@ def test_multiple_snapshots(temp_db):
     assert db.get(b"x") == b"2"
     db.revert(s1)
     assert db.get(b"x") == b"1"
+
+def test_journal_get_many_prefers_pending_writes(temp_db):
+    temp_db.put(b"a", b"disk")
+    temp_db.put(b"b", b"disk")
+    db = JournalDB(temp_db)
+    db.set(b"a", b"pending")
+    assert db.get_many([b"a", b"b", b"c"]) == {b"a": b"pending", b"b": b"disk", b"c": None}
+
+def test_commit_without_snapshot_flushes_everything(temp_db):
+    db = JournalDB(temp_db)
+    db.set(b"a", b"1")
+    db.snapshot()
+    db.set(b"a", b"2")
+    db.delete(b"b")
+    db.commit()
+    assert temp_db.get(b"a") == b"2"
+    assert db._ids == [] and len(db._layers) == 0
+
+def test_commit_keeps_later_snapshots_revertible(temp_db):
+    db = JournalDB(temp_db)
+    s1 = db.snapshot()
+    db.set(b"a", b"1")
+    db.set(b"b", b"1")
+    s2 = db.snapshot()
+    db.set(b"a", b"2")
+    db.set(b"c", b"2")
+    db.commit(s1)
+    assert temp_db.get(b"a") == b"1"
+    assert temp_db.get(b"c") is None
+    assert db.get(b"a") == b"2"
+    db.revert(s2)
+    assert db.get(b"a") == b"1"
+    assert db.get(b"b") == b"1"
+    assert db.get(b"c") is None
+
+def test_revert_restores_pending_delete(temp_db):
+    temp_db.put(b"k", b"disk")
+    db = JournalDB(temp_db)
+    db.delete(b"k")
+    snap = db.snapshot()
+    db.set(b"k", b"new")
+    db.revert(snap)
+    assert db.get(b"k") is None
+
+def test_commit_writes_each_key_once(temp_db):
+    writes = []
+    original = temp_db.apply_batch
+    temp_db.apply_batch = lambda ops: (writes.append(dict(ops)), original(ops))
+    db = JournalDB(temp_db)
+    for i in range(100):
+        db.snapshot()
+        db.set(b"hot", b"%d" % i)
+    db.commit()
+    assert writes == [{b"hot": b"99"}]
+
+def test_detached_diff_readable_until_released(temp_db):
+    db = JournalDB(temp_db)
+    db.set(b"key1", b"val1")
+    dirty = db.detach()
+    assert dirty == {b"key1": b"val1"}
+    assert temp_db.get(b"key1") is None
+    assert db.get(b"key1") == b"val1"
+    snap = db.snapshot()
+    db.set(b"key1", b"val2")
+    assert db.get_many([b"key1"]) == {b"key1": b"val2"}
+
+    temp_db.apply_batch(dirty)
+    db.release(dirty)
+    db.revert(snap)
+    assert db.get(b"key1") == b"val1"
@@ -0,0 +1,94 @@
+import os
+import tempfile
+
+import pytest
+
+from ethereum_node.db.kv import KeyValueDB
+
+
+@pytest.fixture
+def temp_db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = KeyValueDB(os.path.join(tmpdir, "kv.db"))
+        yield db
+        db.close()
+
+
+def test_put_get_delete(temp_db):
+    temp_db.put(b"k", b"v")
+    assert temp_db.get(b"k") == b"v"
+    temp_db.delete(b"k")
+    assert temp_db.get(b"k") is None
+
+
+def test_wal_mode(temp_db):
+    mode = temp_db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_write_batch_applies_on_exit(temp_db):
+    temp_db.put(b"old", b"1")
+    with temp_db.write_batch() as batch:
+        batch.put(b"a", b"1")
+        batch.put(b"b", b"2")
+        batch.delete(b"old")
+        assert temp_db.get(b"a") is None  # nothing written before commit
+    assert temp_db.get(b"a") == b"1"
+    assert temp_db.get(b"b") == b"2"
+    assert temp_db.get(b"old") is None
+
+
+def test_write_batch_last_operation_wins(temp_db):
+    batch = temp_db.write_batch()
+    batch.put(b"k", b"1")
+    batch.delete(b"k")
+    batch.put(b"j", b"1")
+    batch.put(b"j", b"2")
+    assert len(batch) == 2
+    batch.commit()
+    assert temp_db.get(b"k") is None
+    assert temp_db.get(b"j") == b"2"
+    assert len(batch) == 0
+
+
+def test_write_batch_discarded_on_error(temp_db):
+    with pytest.raises(RuntimeError):
+        with temp_db.write_batch() as batch:
+            batch.put(b"a", b"1")
+            raise RuntimeError("abort")
+    assert temp_db.get(b"a") is None
+
+
+def test_get_many(temp_db):
+    with temp_db.write_batch() as batch:
+        for i in range(1200):
+            batch.put(b"k%d" % i, b"v%d" % i)
+    keys = [b"k%d" % i for i in range(0, 1200, 2)] + [b"missing"]
+    found = temp_db.get_many(keys)
+    assert len(found) == len(keys)
+    assert found[b"k1198"] == b"v1198"
+    assert found[b"missing"] is None
+
+
+def test_iterate_prefix_in_key_order(temp_db):
+    for key in (b"b2", b"a1", b"b1", b"c", b"b"):
+        temp_db.put(key, key.upper())
+    assert list(temp_db.iterate(b"b")) == [(b"b", b"B"), (b"b1", b"B1"), (b"b2", b"B2")]
+    assert [k for k, _ in temp_db.iterate()] == [b"a1", b"b", b"b1", b"b2", b"c"]
+
+
+def test_iterate_prefix_ending_in_ff(temp_db):
+    temp_db.apply_batch({b"a\xff": b"1", b"a\xff\x00": b"2", b"b": b"3", b"\xff\xff": b"4"})
+    assert [k for k, _ in temp_db.iterate(b"a\xff")] == [b"a\xff", b"a\xff\x00"]
+    assert [k for k, _ in temp_db.iterate(b"\xff")] == [b"\xff\xff"]
+
+
+def test_snapshot_ignores_later_writes(temp_db):
+    temp_db.put(b"a", b"1")
+    with temp_db.snapshot() as snap:
+        temp_db.put(b"a", b"2")
+        temp_db.put(b"b", b"3")
+        assert snap.get(b"a") == b"1"
+        assert snap.get_many([b"a", b"b"]) == {b"a": b"1", b"b": None}
+        assert list(snap.iterate()) == [(b"a", b"1")]
+    assert temp_db.get(b"a") == b"2"
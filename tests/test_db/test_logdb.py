@@ -0,0 +1,71 @@
+import os
+import tempfile
+import pytest
+
+from ethereum_node.db.logdb import INITIAL_SLOTS, LogDB
+from ethereum_node.state.trie import Trie
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield os.path.join(tmpdir, "logdb")
+
+def test_put_get_delete(db_path):
+    db = LogDB(db_path)
+    db.put(b"key", b"value")
+    assert db.get(b"key") == b"value"
+    db.put(b"key", b"other")
+    assert db.get(b"key") == b"other"
+    db.delete(b"key")
+    assert db.get(b"key") is None
+    assert db.get(b"missing") is None
+
+def test_get_view_is_zero_copy_and_survives_growth(db_path):
+    db = LogDB(db_path)
+    db.put(b"k", b"v" * 100)
+    view = db.get_view(b"k")
+    assert isinstance(view, memoryview)
+    db.put(b"big", bytes(4 << 20))  # forces the log to be remapped
+    assert bytes(view) == b"v" * 100
+    view.release()
+
+def test_reopen_and_rebuild_index(db_path):
+    db = LogDB(db_path)
+    with db.write_batch() as batch:
+        for i in range(INITIAL_SLOTS):  # enough to resize the index
+            batch.put(b"k%d" % i, b"v%d" % i)
+    db.delete(b"k7")
+    db.close()
+
+    db = LogDB(db_path)
+    assert db.get(b"k100") == b"v100"
+    assert db.get(b"k7") is None
+    db.close()
+
+    os.remove(os.path.join(db_path, "data.idx"))
+    db = LogDB(db_path)
+    assert db.get(b"k4000") == b"v4000"
+    assert db.get(b"k7") is None
+
+def test_iterate_and_snapshot(db_path):
+    db = LogDB(db_path)
+    for key in (b"b2", b"a", b"b1"):
+        db.put(key, key)
+    snap = db.snapshot()
+    db.put(b"b3", b"new")
+    db.put(b"b1", b"changed")
+    db.delete(b"a")
+    assert list(db.iterate(b"b")) == [(b"b1", b"changed"), (b"b2", b"b2"), (b"b3", b"new")]
+    assert list(snap.iterate()) == [(b"a", b"a"), (b"b1", b"b1"), (b"b2", b"b2")]
+    assert snap.get(b"b3") is None
+    snap.close()
+    assert not list(db._snapshots)
+
+def test_trie_on_logdb(db_path):
+    db = LogDB(db_path)
+    trie = Trie(db)
+    for key, value in [(b"do", b"verb"), (b"dog", b"puppy"), (b"doge", b"coin"), (b"horse", b"stallion")]:
+        trie.update(key, value)
+    root = trie.root_hash()
+    assert root.hex() == "5991bb8c6514148a29db676a14ac506cd2cd5775ace63c30a4fe457715e9ac84"
+    assert Trie(db, root=root, cache=None).get(b"doge") == b"coin"
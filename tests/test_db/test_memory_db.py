@@ -0,0 +1,54 @@
+import os
+import tempfile
+import time
+import pytest
+
+from ethereum_node.db.memory import MemoryDB, load_snapshot
+from ethereum_node.state.trie import Trie
+
+@pytest.fixture
+def snap_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield os.path.join(tmpdir, "state.snap")
+
+def test_basic_operations():
+    db = MemoryDB()
+    db.put(b"a", b"1")
+    with db.write_batch() as batch:
+        batch.put(b"b", b"2")
+        batch.delete(b"a")
+    assert db.get(b"a") is None
+    assert db.get_many([b"a", b"b"]) == {b"a": None, b"b": b"2"}
+    db.put(b"ba", b"3")
+    assert list(db.iterate(b"b")) == [(b"b", b"2"), (b"ba", b"3")]
+
+def test_snapshot_is_isolated():
+    db = MemoryDB()
+    db.put(b"a", b"1")
+    with db.snapshot() as snap:
+        db.put(b"a", b"2")
+        db.put(b"b", b"3")
+        assert snap.get(b"a") == b"1"
+        assert list(snap.iterate()) == [(b"a", b"1")]
+
+def test_snapshot_file_round_trip(snap_path):
+    db = MemoryDB(snap_path)
+    trie = Trie(db)
+    for i in range(100):
+        trie.update(i.to_bytes(32, "big"), b"v%d" % i)
+    root = trie.root_hash()
+    db.close()
+
+    reloaded = MemoryDB(snap_path)
+    assert len(reloaded) == len(load_snapshot(snap_path))
+    assert Trie(reloaded, root=root, cache=None).get((42).to_bytes(32, "big")) == b"v42"
+
+def test_background_thread_saves_changes(snap_path):
+    db = MemoryDB(snap_path, interval=0.01)
+    db.put(b"k", b"v")
+    deadline = time.time() + 5
+    while not os.path.exists(snap_path) and time.time() < deadline:
+        time.sleep(0.01)
+    assert load_snapshot(snap_path) == {b"k": b"v"}
+    db.close()
+    assert db._thread is None
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+from ethereum_node.evm.analysis import CodeAnalysis, analyze_code
+from ethereum_node.evm.gas import GAS_COSTS
+from ethereum_node.utils.hash import keccak256
+
+
+def test_straight_line_is_one_block():
+    code = bytes([0x60, 0x03, 0x60, 0x04, 0x01, 0x00])  # PUSH1 PUSH1 ADD STOP
+    analysis = CodeAnalysis(code)
+    assert analysis.blocks == {0: (3 + 3 + 3 + 0, 4)}
+
+
+def test_blocks_split_at_jumps_and_jumpdests():
+    # PUSH1 0x05 JUMP | PUSH1 0x00 | JUMPDEST POP STOP
+    code = bytes([0x60, 0x05, 0x56, 0x60, 0x00, 0x5b, 0x50, 0x00])
+    analysis = CodeAnalysis(code)
+    assert analysis.blocks == {
+        0: (GAS_COSTS[0x60] + GAS_COSTS[0x56], 2),
+        3: (GAS_COSTS[0x60], 1),
+        5: (GAS_COSTS[0x5b] + GAS_COSTS[0x50], 3),
+    }
+
+
+def test_jumpdest_inside_push_data_is_not_a_boundary():
+    code = bytes([0x61, 0x5b, 0x5b, 0x50])  # PUSH2 0x5b5b POP
+    analysis = CodeAnalysis(code)
+    assert analysis.blocks == {0: (GAS_COSTS[0x61] + GAS_COSTS[0x50], 2)}
+
+
+def test_empty_code_has_no_blocks():
+    assert CodeAnalysis(b"").blocks == {}
+
+
+def test_jumpdest_bitmap_skips_push_data():
+    # JUMPDEST PUSH2 0x5b5b JUMPDEST
+    code = bytes([0x5b, 0x61, 0x5b, 0x5b, 0x5b])
+    analysis = CodeAnalysis(code)
+    assert [analysis.is_jumpdest(i) for i in range(5)] == [True, False, False, False, True]
+    assert not analysis.is_jumpdest(5)
+    assert not analysis.is_jumpdest(2**256 - 1)
+
+
+def test_analysis_is_cached_by_code_hash():
+    code = bytes([0x60, 0x01, 0x5b, 0x00])
+    first = analyze_code(code)
+    assert analyze_code(bytes(bytearray(code))) is first
+    assert analyze_code(code, code_hash=keccak256(code)) is first
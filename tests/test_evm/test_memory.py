@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import pytest
+from ethereum_node.evm.gas import memory_expansion_cost
 from ethereum_node.evm.memory import Memory
 
 def test_memory_store_and_load():
@@ -34,3 +35,39 @@ def test_memory_load_negative_args():
         mem.load(-1, 10)
     with pytest.raises(ValueError):
         mem.load(0, -5)
+
+def test_memory_expansion_cost_is_quadratic():
+    mem = Memory()
+    assert mem.expansion_cost(0, 0) == 0
+    assert mem.expansion_cost(0, 32) == 3
+    assert mem.expansion_cost(0, 1024 * 32) == 1024 * 3 + 1024 * 1024 // 512
+
+def test_memory_expansion_cost_is_incremental():
+    mem = Memory()
+    mem.extend(64)
+    assert mem.words == 2
+    assert mem.expansion_cost(0, 64) == 0
+    assert mem.expansion_cost(64, 32) == memory_expansion_cost(3) - memory_expansion_cost(2)
+
+def test_memory_backing_grows_geometrically():
+    mem = Memory()
+    mem.extend(32)
+    mem.extend(64)
+    assert len(mem) == 64
+    assert len(mem.data) >= 64
+    capacity = len(mem.data)
+    mem.extend(capacity + 1)
+    assert len(mem.data) >= 2 * capacity
+
+def test_memory_zero_size_read_does_not_expand():
+    mem = Memory()
+    assert mem.load(1000, 0) == b""
+    assert len(mem) == 0
+
+def test_memory_view():
+    mem = Memory()
+    mem.store(0, b"hello")
+    with mem.view(1, 3) as view:
+        assert view == b"ell"
+    mem.store(4096, b"x")  # buffer can grow again once the view is released
+    assert mem.load(4096, 1) == b"x"
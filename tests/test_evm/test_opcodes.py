@@ -7,6 +7,7 @@ from ethereum_node.evm.memory import Memory
 from ethereum_node.evm.storage import JournaledStorage
 from ethereum_node.evm.opcodes import OPCODES
 from ethereum_node.evm.opcodes import Halt
+from ethereum_node.evm.analysis import analyze_code
 
 class DummyContext:
     def __init__(self):
@@ -19,6 +20,10 @@ class DummyContext:
         self.stopped = False
         self.gas_left = 10**6
 
+    @property
+    def analysis(self):
+        return analyze_code(self.code)
+
     def read_bytes(self, n):
         data = self.code[self.pc + 1 : self.pc + 1 + n]
         self.pc += n
@@ -74,6 +79,13 @@ def test_basic_arithmetic(opcode, a, b, expected):
     run_opcode(opcode, ctx)
     assert ctx.stack.pop() == expected
 
+def test_sub_wraps_to_uint256():
+    ctx = DummyContext()
+    ctx.stack.push(3)
+    ctx.stack.push(5)
+    run_opcode(0x03, ctx)  # SUB
+    assert ctx.stack.pop() == 2**256 - 2
+
 def test_stop():
     ctx = DummyContext()
     with pytest.raises(Halt):
@@ -143,6 +155,13 @@ def test_jump_invalid():
     with pytest.raises(Exception):
         run_opcode(0x56, ctx)
 
+def test_jump_into_push_data():
+    ctx = DummyContext()
+    ctx.code = bytes([0x60, 0x5b, 0x00])  # PUSH1 0x5b STOP
+    ctx.stack.push(1)
+    with pytest.raises(Exception, match="Invalid jump destination"):
+        run_opcode(0x56, ctx)
+
 def test_jumpi_taken():
     ctx = DummyContext()
     ctx.code = b"\x00" * 20 + b"\x5b"
@@ -209,3 +228,16 @@ def test_revert():
     with pytest.raises(Halt) as exc_info:
         run_opcode(0xfd, ctx)
     assert exc_info.value.return_data == b"oops!"
+
+# --- Dispatch table ---
+
+def test_jump_table_covers_all_opcodes():
+    from ethereum_node.evm.opcodes import JUMP_TABLE
+    from ethereum_node.evm.gas import GAS_COSTS
+    assert len(JUMP_TABLE) == 256
+    handler, gas = JUMP_TABLE[0x01]
+    assert handler is OPCODES[0x01]
+    assert gas == GAS_COSTS[0x01]
+    ctx = DummyContext()
+    with pytest.raises(NotImplementedError):
+        JUMP_TABLE[0xfe][0](ctx)
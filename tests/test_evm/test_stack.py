@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
 import pytest
-from ethereum_node.evm.stack import EVMStack, StackOverflow, StackUnderflow
+from ethereum_node.evm.stack import (EVMStack, FastStack, StackOverflow,
+                                     StackUnderflow)
 
 def test_push_pop_roundtrip():
     stack = EVMStack()
@@ -69,3 +70,46 @@ def test_stack_length():
     assert len(stack) == 2
     stack.pop()
     assert len(stack) == 1
+
+
+# --- FastStack ---
+
+def test_fast_push_pop_roundtrip():
+    stack = FastStack()
+    stack.push(1)
+    stack.push(2)
+    assert stack.pop() == 2
+    assert stack.pop() == 1
+    assert len(stack) == 0
+
+def test_fast_pop_at_depth():
+    stack = FastStack()
+    for value in (1, 2, 3):
+        stack.push(value)
+    assert stack.pop(1) == 2
+    assert stack.peek() == 3
+    assert stack.peek(1) == 1
+    assert len(stack) == 2
+
+def test_fast_peek_and_set():
+    stack = FastStack()
+    stack.push(10)
+    stack.push(20)
+    stack.set(1, 40)
+    assert stack.peek(1) == 40
+    with pytest.raises(StackUnderflow):
+        stack.set(2, 0)
+    with pytest.raises(StackUnderflow):
+        stack.peek(2)
+
+def test_fast_underflow():
+    stack = FastStack()
+    with pytest.raises(StackUnderflow):
+        stack.pop()
+
+def test_fast_overflow():
+    stack = FastStack()
+    for i in range(1024):
+        stack.push(i)
+    with pytest.raises(StackOverflow):
+        stack.push(999)
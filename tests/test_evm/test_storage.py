@@ -50,3 +50,31 @@ def test_storage_multiple_keys_revert_and_commit():
 
     assert storage.load(0x01) == 0x1111
     assert storage.load(0x02) == 0x2222
+
+
+def test_storage_nested_snapshots():
+    storage = JournaledStorage()
+    storage.store(0x01, 1)
+    outer = storage.snapshot()
+    storage.store(0x01, 2)
+    inner = storage.snapshot()
+    storage.store(0x01, 3)
+    storage.store(0x02, 3)
+
+    storage.revert(inner)
+    assert storage.load(0x01) == 2
+    assert storage.load(0x02) == 0
+
+    storage.revert(outer)
+    assert storage.load(0x01) == 1
+
+
+def test_storage_merge_keeps_changes_for_outer_revert():
+    storage = JournaledStorage()
+    outer = storage.snapshot()
+    inner = storage.snapshot()
+    storage.store(0x01, 5)
+    storage.merge(inner)
+    assert storage.load(0x01) == 5
+    storage.revert(outer)
+    assert storage.load(0x01) == 0
@@ -11,7 +11,7 @@ class DummyTracer:
         self.steps = []
 
     def step(self, vm, opcode):
-        self.steps.append((vm.pc - 1, opcode))
+        self.steps.append((vm.pc, opcode))
 
 
 def test_addition():
@@ -54,3 +54,88 @@ def test_tracer():
     evm = EVM(code, tracer=tracer)
     evm.run()
     assert [op for _, op in tracer.steps] == [0x60, 0x60, 0x01, 0x00]
+
+
+def test_tracer_records_pc():
+    code = bytes([0x60, 0x01, 0x60, 0x02, 0x01, 0x00])
+    tracer = DummyTracer()
+    EVM(code, tracer=tracer).run()
+    assert [pc for pc, _ in tracer.steps] == [0, 2, 4, 5]
+
+
+def test_invalid_opcode_traced():
+    evm = EVM(bytes([0xfe]), tracer=DummyTracer())
+    with pytest.raises(NotImplementedError):
+        evm.run()
+
+
+def test_jump_lands_on_jumpdest():
+    # PUSH1 0x04 JUMP INVALID JUMPDEST PUSH1 0x2a STOP
+    code = bytes([0x60, 0x04, 0x56, 0xfe, 0x5b, 0x60, 0x2a, 0x00])
+    evm = EVM(code)
+    evm.run()
+    assert evm.stack.pop() == 0x2a
+
+
+def test_fast_and_traced_gas_match():
+    code = bytes([0x60, 0x03, 0x60, 0x04, 0x01, 0x50, 0x00])
+    fast = EVM(code)
+    fast.run()
+    traced = EVM(code, tracer=DummyTracer())
+    traced.run()
+    assert fast.gas_left == traced.gas_left == 10**6 - 3 - 3 - 3 - 2
+
+
+def test_block_gas_charged_before_execution():
+    # PUSH1 0x01 PUSH1 0x02 ADD STOP costs 9; 8 gas fails before any op runs
+    code = bytes([0x60, 0x01, 0x60, 0x02, 0x01, 0x00])
+    evm = EVM(code, gas=8)
+    with pytest.raises(Exception, match="Out of gas"):
+        evm.run()
+    assert len(evm.stack) == 0
+
+
+def test_jumpi_loop_gas_matches_traced():
+    # counter = 3; loop: JUMPDEST, counter -= 1, JUMPI back while non-zero
+    code = bytes([
+        0x60, 0x03,        # PUSH1 3
+        0x5b,              # JUMPDEST (pc 2)
+        0x60, 0x01,        # PUSH1 1
+        0x03,              # SUB
+        0x80,              # DUP1
+        0x60, 0x02,        # PUSH1 2
+        0x57,              # JUMPI
+        0x00,              # STOP
+    ])
+    fast = EVM(code)
+    fast.run()
+    traced = EVM(code, tracer=DummyTracer())
+    traced.run()
+    assert fast.stack.pop() == 0
+    assert fast.gas_left == traced.gas_left
+
+
+def test_checked_stack_mode():
+    code = bytes([0x60, 0x03, 0x60, 0x04, 0x01, 0x00])
+    evm = EVM(code, fast_stack=False)
+    evm.run()
+    assert isinstance(evm.stack, EVMStack)
+    assert evm.stack.pop() == 7
+
+
+def test_mstore_charges_memory_expansion():
+    # PUSH1 0x2a PUSH1 0x00 MSTORE STOP -> 3 + 3 + 3 + one word of memory
+    code = bytes([0x60, 0x2a, 0x60, 0x00, 0x52, 0x00])
+    evm = EVM(code)
+    evm.run()
+    assert evm.gas_left == 10**6 - 9 - 3
+    assert evm.memory.load(0, 32) == (0x2a).to_bytes(32, "big")
+
+
+def test_huge_memory_offset_runs_out_of_gas():
+    # PUSH1 0x00 PUSH4 0xffffffff MSTORE
+    code = bytes([0x60, 0x00, 0x63, 0xff, 0xff, 0xff, 0xff, 0x52])
+    evm = EVM(code)
+    with pytest.raises(Exception, match="Out of gas"):
+        evm.run()
+    assert len(evm.memory) == 0
@@ -0,0 +1,27 @@
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from ethereum_node.state.account import Account
+from ethereum_node.utils.rlp import decode
+
+
+def test_from_rlp_round_trip():
+    acct = Account(nonce=5, balance=10**18, storage_root=b'\x01' * 32, code_hash=b'\x02' * 32)
+    decoded = Account.from_rlp(acct.rlp())
+    assert decoded == acct
+    assert decoded.rlp() == acct.rlp()
+
+
+def test_rlp_cached_and_replace_starts_uncached():
+    acct = Account(nonce=0, balance=1, storage_root=b'\x01' * 32, code_hash=b'\x02' * 32)
+    first = acct.rlp()
+    assert acct.rlp() is first
+    with pytest.raises(FrozenInstanceError):
+        acct.balance = 2
+    assert decode(replace(acct, balance=2).rlp())[1] == b'\x02'
+
+
+def test_slotted():
+    acct = Account(nonce=0, balance=0, storage_root=b"", code_hash=b"")
+    assert not hasattr(acct, "__dict__")
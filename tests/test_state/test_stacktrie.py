@@ -0,0 +1,60 @@
+import os
+import random
+import tempfile
+
+import pytest
+
+from ethereum_node.db.kv import KeyValueDB
+from ethereum_node.state.stacktrie import StackTrie, build_trie
+from ethereum_node.state.trie import EMPTY_ROOT, Trie
+
+
+@pytest.fixture
+def temp_db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield KeyValueDB(os.path.join(tmpdir, "stacktrie.db"))
+
+
+def _reference_root(db, items):
+    trie = Trie(db, cache=None)
+    for key, value in items:
+        trie.update(key, value)
+    return trie.root_hash()
+
+
+def test_empty(temp_db):
+    assert build_trie(temp_db, []) == EMPTY_ROOT
+
+
+def test_single_key(temp_db):
+    items = [(b"dog", b"puppy")]
+    assert build_trie(temp_db, items) == _reference_root(temp_db, items)
+
+
+def test_prefix_keys(temp_db):
+    items = [(b"do", b"verb"), (b"dog", b"puppy"), (b"doge", b"coin"), (b"horse", b"stallion")]
+    root = build_trie(temp_db, items)
+    assert root.hex() == "5991bb8c6514148a29db676a14ac506cd2cd5775ace63c30a4fe457715e9ac84"
+    reopened = Trie(temp_db, root=root, cache=None)
+    for key, value in items:
+        assert reopened.get(key) == value
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_incremental_trie(temp_db, seed):
+    rng = random.Random(seed)
+    items = {}
+    for _ in range(200):
+        key = bytes(rng.randrange(256) for _ in range(rng.choice([1, 2, 3, 32])))
+        items[key] = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 40)))
+    ordered = sorted(items.items())
+    assert build_trie(temp_db, iter(ordered)) == _reference_root(temp_db, ordered)
+
+
+def test_rejects_unsorted_keys(temp_db):
+    builder = StackTrie(temp_db)
+    builder.update(b"b", b"1")
+    with pytest.raises(ValueError):
+        builder.update(b"a", b"2")
+    with pytest.raises(ValueError):
+        builder.update(b"b", b"3")
@@ -1,9 +1,8 @@
-import os
-import tempfile
 import pytest
 
-from ethereum_node.db.kv import KeyValueDB
-from ethereum_node.state.state import State
+from ethereum_node.db.memory import MemoryDB
+from ethereum_node.state.trie import Trie
+from ethereum_node.state.state import State, account_key, storage_key
 from ethereum_node.state.account import Account
 from ethereum_node.utils.hash import keccak256
 from ethereum_node.utils.rlp import encode
@@ -11,10 +10,7 @@ from ethereum_node.utils.rlp import encode
 
 @pytest.fixture
 def temp_state():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = os.path.join(tmpdir, "test_state.db")
-        db = KeyValueDB(db_path)
-        yield State(db)
+    return State(MemoryDB())
 
 
 def test_set_and_get_account(temp_state):
@@ -65,3 +61,111 @@ def test_commit(temp_state):
     temp_state.set_account(addr, acct)
     temp_state.commit()
     assert temp_state.get_account(addr).balance == 700
+
+
+def test_reads_use_flat_snapshot(temp_state, monkeypatch):
+    addr = b'\x05' * 20
+    acct = Account(nonce=3, balance=7, storage_root=keccak256(encode(b"")), code_hash=keccak256(b""))
+    temp_state.set_account(addr, acct)
+    temp_state.set_storage(addr, b'\x00' * 32, b'\x2a')
+
+    def no_trie(*args):
+        raise AssertionError("read went through the trie")
+    monkeypatch.setattr(temp_state.trie, "get", no_trie)
+    monkeypatch.setattr(temp_state, "get_storage_trie", no_trie)
+    assert temp_state.get_account(addr).nonce == 3
+    assert temp_state.get_storage(addr, b'\x00' * 32) == b'\x2a'
+    assert temp_state.get_storage(b'\x06' * 20, b'\x00' * 32) == b""
+
+
+def test_flat_snapshot_follows_revert_and_commit(temp_state):
+    addr = b'\x07' * 20
+    acct = Account(nonce=0, balance=1, storage_root=keccak256(encode(b"")), code_hash=keccak256(b""))
+    temp_state.set_account(addr, acct)
+    snap = temp_state.snapshot()
+    temp_state.set_storage(addr, b'\x01', b'\x02')
+    temp_state.revert(snap)
+    assert temp_state.get_storage(addr, b'\x01') == b""
+
+    temp_state.set_storage(addr, b'\x01', b'\x03')
+    temp_state.commit()
+    db = temp_state.journal.db
+    assert db.get(storage_key(addr, b'\x01')) == b'\x03'
+    assert db.get(account_key(addr)) == temp_state.trie.get(addr)
+
+
+def _empty_account(balance=0):
+    return Account(nonce=0, balance=balance, storage_root=keccak256(encode(b"")), code_hash=keccak256(b""))
+
+
+def test_dirty_accounts_encoded_once_per_flush(temp_state, monkeypatch):
+    a, b = b'\x10' * 20, b'\x11' * 20
+    temp_state.set_account(a, _empty_account(100))
+    calls = []
+    original = Account.rlp
+    monkeypatch.setattr(Account, "rlp", lambda self: calls.append(self) or original(self))
+    temp_state.transfer(a, b, 10)
+    temp_state.set_storage(a, b'\x01' * 32, b'\x05')
+    temp_state.transfer(b, a, 3)
+    assert calls == []
+    temp_state.state_root()
+    assert len(calls) == 2
+
+
+def test_state_root_matches_plain_tries(temp_state):
+    a, b = b'\x20' * 20, b'\x21' * 20
+    temp_state.set_account(a, _empty_account(50))
+    temp_state.set_storage(a, b'\x01' * 32, b'\x07')
+    temp_state.transfer(a, b, 20)
+    temp_state.set_storage(a, b'\x02' * 32, b'\x08')
+    root = temp_state.state_root()
+
+    db = MemoryDB()
+    storage = Trie(db)
+    storage.update(b'\x01' * 32, b'\x07')
+    storage.update(b'\x02' * 32, b'\x08')
+    accounts = Trie(db)
+    accounts.update(a, Account(0, 30, storage.root_hash(), keccak256(b"")).rlp())
+    accounts.update(b, Account(0, 20, keccak256(encode(b"")), keccak256(b"")).rlp())
+    assert root == accounts.root_hash()
+    assert temp_state.get_account(a).storage_root == storage.root_hash()
+
+
+def test_revert_across_flush(temp_state):
+    a = b'\x30' * 20
+    temp_state.set_account(a, _empty_account(1))
+    before = temp_state.state_root()
+    snap = temp_state.snapshot()
+    temp_state.set_account(a, _empty_account(2))
+    temp_state.set_storage(a, b'\x01', b'\x01')
+    temp_state.state_root()
+    temp_state.revert(snap)
+    assert temp_state.get_account(a).balance == 1
+    assert temp_state.get_storage(a, b'\x01') == b""
+    assert temp_state.state_root() == before
+
+
+def test_flush_visits_only_accounts_written_this_epoch(temp_state, monkeypatch):
+    for i in range(50):
+        temp_state.get_account(bytes([i]) * 20)            # cached, clean
+    a = b'\x40' * 20
+    temp_state.set_account(a, _empty_account(5))
+    monkeypatch.setattr(temp_state._accounts, "keys", lambda: pytest.fail("scanned the whole cache"))
+    seen = []
+    get = temp_state._accounts.get
+    monkeypatch.setattr(temp_state._accounts, "get", lambda key, *args: seen.append(key) or get(key, *args))
+    temp_state.state_root()
+    assert seen == [a]
+
+
+def test_revert_to_unflushed_epoch_reflushes_its_writes(temp_state):
+    a, b = b'\x50' * 20, b'\x51' * 20
+    temp_state.set_account(a, _empty_account(7))
+    snap = temp_state.snapshot()
+    temp_state.set_account(b, _empty_account(8))
+    temp_state.state_root()
+    temp_state.revert(snap)
+
+    expected = State(MemoryDB())
+    expected.set_account(a, _empty_account(7))
+    assert temp_state.state_root() == expected.state_root()
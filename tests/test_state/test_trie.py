@@ -1,7 +1,7 @@
 import tempfile
 import os
 import pytest
-from ethereum_node.state.trie import Trie
+from ethereum_node.state.trie import EMPTY_ROOT, NodeCache, Trie
 from ethereum_node.db.kv import KeyValueDB  # Adjust path if needed
 
 @pytest.fixture
@@ -45,3 +45,155 @@ def test_long_common_prefix(temp_db):
     assert trie.get(b"abcdef") == b"val1"
     assert trie.get(b"abcxyz") == b"val2"
     assert trie.get(b"abc") is None
+
+
+def _fill(trie, n=50):
+    for i in range(n):
+        trie.update(i.to_bytes(4, "big") * 8, b"value-%d" % i)
+
+
+def test_node_cache_serves_resolves(temp_db):
+    cache = NodeCache()
+    trie = Trie(temp_db, cache=cache)
+    _fill(trie)
+    cache.clear()
+    reader = Trie(temp_db, cache=cache)
+    reader.root = trie.root
+    assert reader.get((7).to_bytes(4, "big") * 8) == b"value-7"
+    misses = cache.misses
+    assert reader.get((7).to_bytes(4, "big") * 8) == b"value-7"
+    assert cache.misses == misses
+    assert cache.hits > 0
+
+
+def test_node_cache_entries_are_not_mutated_by_updates(temp_db):
+    cache = NodeCache()
+    trie = Trie(temp_db, cache=cache)
+    _fill(trie)
+    old_root = trie.root
+    trie.update((3).to_bytes(4, "big") * 8, b"changed")
+    old = Trie(temp_db, cache=cache)
+    old.root = old_root
+    assert old.get((3).to_bytes(4, "big") * 8) == b"value-3"
+    assert trie.get((3).to_bytes(4, "big") * 8) == b"changed"
+
+
+def test_node_cache_entries_are_fully_indexed(temp_db):
+    cache = NodeCache()
+    trie = Trie(temp_db, cache=cache)
+    _fill(trie)
+    cache.clear()
+    reader = Trie(temp_db, root=trie.root_hash(), cache=cache)
+    assert reader.get((7).to_bytes(4, "big") * 8) == b"value-7"
+    for node_hash in list(cache._lru._data):
+        node = cache.get(node_hash)
+        assert node._pos == node._end    # no scan left to do: read-only
+
+
+def test_node_cache_respects_byte_budget(temp_db):
+    cache = NodeCache(max_bytes=1024)
+    trie = Trie(temp_db, cache=cache)
+    _fill(trie)
+    assert 0 < cache.size <= 1024
+    assert trie.get((9).to_bytes(4, "big") * 8) == b"value-9"
+
+
+def test_trie_without_cache(temp_db):
+    trie = Trie(temp_db, cache=None)
+    _fill(trie, 10)
+    assert trie.get((4).to_bytes(4, "big") * 8) == b"value-4"
+
+
+# --- Root hashes and deferred mode ---
+
+VECTOR = [(b"do", b"verb"), (b"dog", b"puppy"), (b"doge", b"coin"), (b"horse", b"stallion")]
+VECTOR_ROOT = bytes.fromhex("5991bb8c6514148a29db676a14ac506cd2cd5775ace63c30a4fe457715e9ac84")
+
+
+def _rows(db):
+    return db.conn.execute("SELECT COUNT(*) FROM kv").fetchone()[0]
+
+
+def test_empty_root(temp_db):
+    assert Trie(temp_db).root_hash() == EMPTY_ROOT
+    assert Trie(temp_db, root=EMPTY_ROOT).get(b"x") is None
+
+
+def test_root_hash_matches_reference_vector(temp_db):
+    trie = Trie(temp_db)
+    for key, value in VECTOR:
+        trie.update(key, value)
+    assert trie.root_hash() == VECTOR_ROOT
+
+
+def test_reopen_from_root_hash(temp_db):
+    trie = Trie(temp_db)
+    trie.update(b"a", b"b")                 # root small enough to be inlined
+    reopened = Trie(temp_db, root=trie.root_hash(), cache=None)
+    assert reopened.get(b"a") == b"b"
+
+
+def test_deferred_writes_nothing_until_commit(temp_db):
+    trie = Trie(temp_db, deferred=True)
+    for key, value in VECTOR:
+        trie.update(key, value)
+    assert _rows(temp_db) == 0
+    assert trie.get(b"doge") == b"coin"
+    assert trie.root_hash() == VECTOR_ROOT
+    assert _rows(temp_db) > 0
+    reopened = Trie(temp_db, root=VECTOR_ROOT, cache=None)
+    assert reopened.get(b"horse") == b"stallion"
+
+
+def test_deferred_repeated_updates_store_only_final_nodes(temp_db):
+    eager = Trie(temp_db)
+    _fill(eager, 20)
+    for i in range(20):
+        eager.update((5).to_bytes(4, "big") * 8, b"v%d" % i)
+    eager_rows = _rows(temp_db)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        other = KeyValueDB(os.path.join(tmpdir, "deferred.db"))
+        deferred = Trie(other, deferred=True)
+        _fill(deferred, 20)
+        for i in range(20):
+            deferred.update((5).to_bytes(4, "big") * 8, b"v%d" % i)
+        assert deferred.commit() == eager.root_hash()
+        assert _rows(other) < eager_rows
+
+
+def test_root_reference_is_a_snapshot(temp_db):
+    trie = Trie(temp_db, deferred=True)
+    _fill(trie, 10)
+    saved = trie.root
+    trie.update((1).to_bytes(4, "big") * 8, b"new")
+    trie.root = saved
+    assert trie.get((1).to_bytes(4, "big") * 8) == b"value-1"
+
+
+def test_get_many_matches_get(temp_db):
+    trie = Trie(temp_db)
+    _fill(trie, 200)
+    root = trie.root_hash()
+    keys = [i.to_bytes(4, "big") * 8 for i in range(0, 220, 3)] + [b"absent"]
+    reopened = Trie(temp_db, root=root, cache=None)
+    expected = {key: reopened.get(key) for key in keys}
+    assert Trie(temp_db, root=root, cache=None).get_many(keys) == expected
+    assert expected[b"absent"] is None
+
+
+def test_items_in_key_order(temp_db):
+    trie = Trie(temp_db)
+    for key, value in VECTOR:
+        trie.update(key, value)
+    reopened = Trie(temp_db, root=trie.root_hash(), cache=NodeCache(1 << 20))
+    assert list(reopened.items()) == sorted(VECTOR)
+    assert list(Trie(temp_db).items()) == []
+
+
+def test_items_walks_hashed_nodes(temp_db):
+    trie = Trie(temp_db)
+    _fill(trie, 200)
+    reopened = Trie(temp_db, root=trie.root_hash(), cache=None)
+    expected = sorted((i.to_bytes(4, "big") * 8, b"value-%d" % i) for i in range(200))
+    assert list(reopened.items()) == expected
@@ -0,0 +1,100 @@
+import pytest
+
+from ethereum_node.block.transaction import Transaction
+from ethereum_node.txpool.pool import TxPool, TxPoolError
+
+A, B, C = b'\xaa' * 20, b'\xbb' * 20, b'\xcc' * 20
+
+
+def tx(sender, nonce, price, data=b""):
+    return Transaction(nonce=nonce, gas_price=price, gas=21000, to=b'\x01' * 20,
+                       value=0, data=data, sender=sender)
+
+
+def test_pending_and_queued_split():
+    pool = TxPool()
+    pool.add(tx(A, 0, 10))
+    pool.add(tx(A, 2, 10))
+    assert [t.nonce for t in pool.pending(A)] == [0]
+    assert [t.nonce for t in pool.queued(A)] == [2]
+    pool.add(tx(A, 1, 10))
+    assert [t.nonce for t in pool.pending(A)] == [0, 1, 2]
+    assert pool.stats() == (3, 0)
+
+
+def test_uses_account_nonce_for_new_senders():
+    pool = TxPool(get_nonce=lambda sender: 5)
+    with pytest.raises(TxPoolError):
+        pool.add(tx(A, 4, 10))
+    pool.add(tx(A, 5, 10))
+    assert pool.stats() == (1, 0)
+
+
+def test_best_orders_by_price_within_nonce_order():
+    pool = TxPool()
+    pool.add(tx(A, 0, 5))
+    pool.add(tx(A, 1, 50))
+    pool.add(tx(B, 0, 20))
+    pool.add(tx(C, 1, 100))  # queued: nonce 0 missing
+    picked = [(t.sender, t.nonce) for t in pool.best()]
+    assert picked == [(B, 0), (A, 0), (A, 1)]
+    assert len(pool.best(1)) == 1
+
+
+def test_replace_by_fee():
+    pool = TxPool()
+    first = tx(A, 0, 100)
+    pool.add(first)
+    with pytest.raises(TxPoolError):
+        pool.add(tx(A, 0, 105, b"x"))
+    better = tx(A, 0, 110, b"y")
+    pool.add(better)
+    assert first.hash() not in pool
+    assert pool.best() == [better]
+    assert len(pool) == 1
+
+
+def test_eviction_at_capacity():
+    pool = TxPool(capacity=3)
+    pool.add(tx(A, 0, 1))
+    pool.add(tx(A, 1, 50))
+    pool.add(tx(B, 0, 10))
+    with pytest.raises(TxPoolError):
+        pool.add(tx(C, 0, 1))
+    pool.add(tx(C, 0, 20))
+    # A's cheapest went, and A's nonce 1 with it since it can no longer run
+    assert pool.pending(A) == [] and pool.queued(A) == []
+    assert {t.sender for t in pool.best()} == {B, C}
+
+
+def test_set_nonce_drops_mined():
+    pool = TxPool()
+    for n in range(3):
+        pool.add(tx(A, n, 10))
+    pool.set_nonce(A, 2)
+    assert [t.nonce for t in pool.pending(A)] == [2]
+    assert len(pool) == 1
+
+
+def test_set_nonce_backwards_requeues():
+    pool = TxPool(get_nonce=lambda sender: 5)
+    pool.add(tx(A, 5, 10))
+    pool.add(tx(A, 6, 10))
+    pool.set_nonce(A, 3)
+    assert pool.stats() == (0, 2)
+    assert pool.pending(A) == []
+    assert [t.nonce for t in pool.queued(A)] == [5, 6]
+    assert pool.best() == []
+    pool.add(tx(A, 3, 10))
+    pool.add(tx(A, 4, 10))
+    assert [t.nonce for t in pool.pending(A)] == [3, 4, 5, 6]
+
+
+def test_remove_demotes_later_nonces():
+    pool = TxPool()
+    txs = [tx(A, n, 10) for n in range(3)]
+    for t in txs:
+        pool.add(t)
+    pool.remove(txs[1].hash())
+    assert [t.nonce for t in pool.pending(A)] == [0]
+    assert [t.nonce for t in pool.queued(A)] == [2]
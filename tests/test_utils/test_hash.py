@@ -14,6 +14,12 @@ def test_keccak256_known():
     )
 
 
+def test_keccak256_memoryview():
+    data = bytearray(b"xhellox")
+    with memoryview(data)[1:6] as view:
+        assert keccak256(view) == keccak256(b"hello")
+
+
 '''Uncomment the below test to check keccak256 performance
 def test_keccak256_performance():
     # Time 1 million calls to keccak256(b"hello")
@@ -0,0 +1,51 @@
+from ethereum_node.utils.layers import MISSING, DiffLayers
+
+
+def test_get_returns_newest_write():
+    layers = DiffLayers()
+    assert layers.get(b"k") is MISSING
+    layers.set(b"k", 1)
+    layers.push()
+    layers.set(b"k", 2)
+    assert layers.get(b"k") == 2
+    layers.pop()
+    assert layers.get(b"k") == 1
+
+
+def test_pop_removes_keys_only_in_top_layer():
+    layers = DiffLayers()
+    layers.push()
+    layers.set(b"a", 1)
+    layers.pop()
+    assert b"a" not in layers
+    assert len(layers) == 0
+
+
+def test_merge_folds_into_layer_below():
+    layers = DiffLayers()
+    layers.set(b"a", 1)
+    layers.push()
+    layers.push()
+    layers.set(b"a", 2)
+    layers.set(b"b", 3)
+    layers.merge()
+    assert layers.depth == 1
+    assert layers.get(b"a") == 2
+    layers.pop()
+    assert layers.get(b"a") == 1
+    assert layers.get(b"b") is MISSING
+
+
+def test_flatten_keeps_upper_layers():
+    layers = DiffLayers()
+    layers.set(b"a", 1)
+    layers.push()
+    layers.set(b"a", 2)
+    layers.push()
+    layers.set(b"b", 3)
+    assert layers.flatten(1) == {b"a": 2}
+    assert layers.depth == 1
+    assert layers.get(b"a") is MISSING
+    assert layers.get(b"b") == 3
+    layers.pop()
+    assert layers.flatten() == {}
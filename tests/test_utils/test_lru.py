@@ -0,0 +1,43 @@
+import pytest
+
+from ethereum_node.utils.lru import LRUCache
+
+
+def test_get_and_put():
+    cache = LRUCache(2)
+    cache.put(b"a", 1)
+    assert cache.get(b"a") == 1
+    assert cache.get(b"b") is None
+    assert cache.get(b"b", 0) == 0
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put(b"a", 1)
+    cache.put(b"b", 2)
+    cache.get(b"a")          # b is now the oldest entry
+    cache.put(b"c", 3)
+    assert b"a" in cache
+    assert b"b" not in cache
+    assert len(cache) == 2
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_size_budget():
+    cache = LRUCache(10)
+    cache.put(b"a", 1, size=4)
+    cache.put(b"b", 2, size=4)
+    assert cache.size == 8
+    cache.put(b"c", 3, size=4)       # over budget: a goes
+    assert b"a" not in cache
+    assert cache.size == 8
+    cache.put(b"b", 2, size=1)       # replacing updates the accounted size
+    assert cache.size == 5
+    cache.put(b"d", 4, size=20)      # larger than the budget on its own
+    assert len(cache) == 0
+    assert cache.size == 0
@@ -3,7 +3,8 @@
 from hypothesis import given
 from hypothesis import strategies as st
 
-from ethereum_node.utils.rlp import decode, encode
+from ethereum_node.utils.rlp import (LazyList, decode, decode_lazy, encode,
+                                     encode_batch)
 
 
 def test_rlp_encode_bytes():
@@ -29,6 +30,32 @@ def test_rlp_encode_list():
     assert encode([b"cat", [b"dog"]]) == b"\xc9\x83cat\xc4\x83dog"
 
 
+def test_rlp_encode_long_payloads():
+    long_list = [b"\x00" * 40, b"\x01" * 40]
+    payload = b"\xa8" + b"\x00" * 40 + b"\xa8" + b"\x01" * 40
+    assert encode(long_list) == b"\xf8\x52" + payload
+    assert encode([long_list]) == b"\xf8\x54\xf8\x52" + payload
+    assert encode(b"\x00" * 1024) == b"\xb9\x04\x00" + b"\x00" * 1024
+    assert encode([0, 127, 128, 2**64]) == b"\xce\x80\x7f\x81\x80\x89\x01" + b"\x00" * 8
+
+
+def test_rlp_encode_rejects_unknown_types():
+    import pytest
+
+    with pytest.raises(TypeError):
+        encode([b"ok", "text"])
+
+
+def test_rlp_encode_batch():
+    items = [b"cat", [b"dog", 1024], b"", [[]]]
+    buf, offsets = encode_batch(items)
+    assert len(offsets) == len(items) + 1
+    assert offsets[-1] == len(buf)
+    for i, item in enumerate(items):
+        assert buf[offsets[i] : offsets[i + 1]] == encode(item)
+    assert encode_batch([]) == (b"", [0])
+
+
 def test_rlp_decode_bytes():
     assert decode(b"\x80") == b""
     assert decode(b"\x01") == b"\x01"
@@ -50,6 +77,34 @@ def test_rlp_decode_lists():
     assert decode(b"\xc8\x83cat\xc4\x83dog") == [b"cat", [b"dog"]]
 
 
+def test_rlp_decode_lazy():
+    encoded = encode([b"cat", [b"dog", [b"puppy"]], b"\x05", b"x" * 60])
+    lazy = decode_lazy(encoded)
+    assert isinstance(lazy, LazyList)
+    assert lazy.decode_at(0) == b"cat"
+    assert lazy[2] == b"\x05"
+    nested = lazy[1]
+    assert isinstance(nested, LazyList)
+    assert nested[1][0] == b"puppy"
+    assert lazy[-1] == b"x" * 60
+    assert len(lazy) == 4
+    assert lazy == decode(encoded)
+    assert lazy.to_list() == decode(encoded)
+
+
+def test_rlp_decode_lazy_raw_at_is_a_view():
+    encoded = encode([b"cat", [b"dog"]])
+    lazy = decode_lazy(encoded)
+    view = lazy.raw_at(1)
+    assert isinstance(view, memoryview)
+    assert view == encode([b"dog"])
+
+
+def test_rlp_decode_lazy_non_list():
+    assert decode_lazy(encode(b"hello")) == b"hello"
+    assert decode_lazy(b"\x05") == b"\x05"
+
+
 def test_rlp_encode_decode_roundtrip():
     cases = [
         b"",
@@ -77,3 +132,9 @@ def test_rlp_roundtrip_hypothesis(values):
     encoded = encode(values)
     decoded = decode(encoded)
     assert decoded == values
+
+
+@given(st.lists(st.binary(min_size=0, max_size=80), max_size=20))
+def test_rlp_lazy_matches_eager_hypothesis(values):
+    encoded = encode(values)
+    assert decode_lazy(encoded).to_list() == decode(encoded)
@@ -0,0 +1,21 @@
+from ethereum_node.utils.hash import keccak256
+from ethereum_node.utils.secp256k1 import N, private_key_to_public_key, recover_public_key, sign
+
+
+def test_sign_and_recover_round_trip():
+    private_key = (12345).to_bytes(32, "big")
+    msg_hash = keccak256(b"message")
+    recovery_id, r, s = sign(msg_hash, private_key)
+    assert s <= N // 2
+    assert recover_public_key(msg_hash, recovery_id, r, s) == private_key_to_public_key(private_key)
+
+
+def test_known_address():
+    # EIP-155 example key
+    public_key = private_key_to_public_key(bytes.fromhex("46" * 32))
+    assert keccak256(public_key)[12:].hex() == "9d8a62f656a8d1615c1294fd71e9cfb3e4855a4f"
+
+
+def test_rejects_out_of_range_signature():
+    assert recover_public_key(b"\x01" * 32, 0, 0, 1) is None
+    assert recover_public_key(b"\x01" * 32, 0, 1, N) is None